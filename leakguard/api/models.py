@@ -151,6 +151,10 @@ class Alert(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='alert_user_created_idx'),
+            models.Index(fields=['user', 'is_read'], name='alert_user_unread_idx'),
+        ]
     
     def __str__(self):
         return f"{self.alert_type}: {self.title}"
@@ -0,0 +1,29 @@
+"""
+Queue-based logging handler for LeakGuard
+
+Log records are pushed onto an in-memory queue by the request thread and
+written to stderr by a background QueueListener thread.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+
+
+def queue_handler():
+    """Build a QueueHandler whose records are emitted by a background listener"""
+    log_queue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(
+        '%(asctime)s %(levelname)s %(name)s: %(message)s'
+    ))
+
+    listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    return logging.handlers.QueueHandler(log_queue)
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+from urllib.parse import urlsplit
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -38,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'socradar.apps.SocradarConfig',
     'django_opensearch_dsl',
     'api',
@@ -199,6 +201,47 @@ DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@leakguard.com
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Logging: records are queued on the request thread and written by a
+# background listener (see leakguard/log_queue.py). LOG_LEVEL applies to the
+# project's own loggers; third-party libraries only log warnings and above.
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'DEBUG' if DEBUG else 'INFO')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'require_debug_false': {
+            '()': 'django.utils.log.RequireDebugFalse',
+        },
+    },
+    'handlers': {
+        'queue': {
+            '()': 'leakguard.log_queue.queue_handler',
+        },
+        'mail_admins': {
+            'level': 'ERROR',
+            'filters': ['require_debug_false'],
+            'class': 'django.utils.log.AdminEmailHandler',
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': 'WARNING',
+    },
+    'loggers': {
+        'django': {
+            'handlers': ['queue', 'mail_admins'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'leakguard': {'level': LOG_LEVEL},
+        'socradar': {'level': LOG_LEVEL},
+        'api': {'level': LOG_LEVEL},
+        'scripts': {'level': LOG_LEVEL},
+    },
+}
+
+
 # --- Authentication redirects ---
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'
@@ -246,6 +289,14 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Cache (shared between web and Celery workers), on the same Redis as Celery but in db 1
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': urlsplit(CELERY_BROKER_URL)._replace(path='/1').geturl(),
+    }
+}
+
 # Email settings
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'  # Or your SMTP server
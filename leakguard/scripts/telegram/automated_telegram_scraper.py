@@ -11,6 +11,7 @@ import time
 import uuid
 import warnings
 import hashlib
+import logging
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Any
 from pathlib import Path
@@ -28,6 +29,8 @@ from telethon.errors import FloodWaitError, SessionPasswordNeededError
 
 # Django imports
 from socradar.models import TelegramChannel, TelegramMessage
+from asgiref.sync import sync_to_async
+from django.db import transaction
 from django.utils import timezone
 from django.conf import settings
 
@@ -36,7 +39,9 @@ from scripts.storage.minio_client import LeakGuardMinioClient
 
 warnings.filterwarnings("ignore", message="Using async sessions support is an experimental feature")
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+@dataclass(slots=True)
 class MessageData:
     message_id: int
     date: str
@@ -57,7 +62,8 @@ class AutomatedTelegramScraper:
     def __init__(self):
         self.client = None
         self.max_concurrent_downloads = 5
-        self.batch_size = 100
+        self.max_concurrent_channels = 5
+        self.batch_size = 200
         self.state_save_interval = 50
         
         # MinIO client for file storage
@@ -138,7 +144,7 @@ class AutomatedTelegramScraper:
         """Upload file to MinIO and return the MinIO path"""
         try:
             # Save to MinIO using our client
-            minio_path = self.minio_client.save_telegram_media(
+            minio_path = await sync_to_async(self.minio_client.save_telegram_media)(
                 local_path,
                 channel_name,
                 message_id,
@@ -147,11 +153,12 @@ class AutomatedTelegramScraper:
             return minio_path
             
         except Exception as e:
-            print(f"Error uploading to MinIO: {e}")
+            logger.error(f"Error uploading to MinIO: {e}")
             return None
 
     async def scrape_channel(self, channel_username: str, offset_id: int = 0):
         """Scrape messages from a specific channel"""
+        media_download = None
         try:
             # Get channel entity
             entity = await self.client.get_entity(channel_username)
@@ -161,10 +168,10 @@ class AutomatedTelegramScraper:
             total_messages = result.total
 
             if total_messages == 0:
-                print(f"No messages found in channel {channel_username}")
+                logger.info(f"No messages found in channel {channel_username}")
                 return
 
-            print(f"Found {total_messages} messages in channel {channel_username}")
+            logger.info(f"Found {total_messages} messages in channel {channel_username}")
 
             message_batch = []
             media_tasks = []
@@ -173,7 +180,7 @@ class AutomatedTelegramScraper:
             semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
 
             # Get or create channel in database
-            channel, created = TelegramChannel.objects.get_or_create(
+            channel, created = await sync_to_async(TelegramChannel.objects.get_or_create)(
                 username=channel_username,
                 defaults={
                     'name': getattr(entity, 'title', channel_username),
@@ -184,7 +191,9 @@ class AutomatedTelegramScraper:
 
             async for message in self.client.iter_messages(entity, offset_id=offset_id, reverse=True):
                 try:
-                    sender = await message.get_sender()
+                    # Use the sender entity bundled with the iter_messages response;
+                    # get_sender() would issue a users.getUsers RPC when it is missing
+                    sender = message.sender
                     
                     msg_data = MessageData(
                         message_id=message.id,
@@ -210,86 +219,128 @@ class AutomatedTelegramScraper:
                     last_message_id = message.id
                     processed_messages += 1
 
-                    # Process batch when it reaches batch_size
+                    # Process batch when it reaches batch_size. Its media downloads in the
+                    # background while the next batch is fetched; at most one batch is
+                    # downloading at a time, so neither list grows with the channel
                     if len(message_batch) >= self.batch_size:
                         await self.process_message_batch(message_batch, channel)
                         message_batch.clear()
+                        if media_tasks:
+                            if media_download:
+                                await media_download
+                            media_download = asyncio.create_task(
+                                self.download_media_files(channel_username, media_tasks)
+                            )
+                            media_tasks = []
 
                     # Progress update
                     if processed_messages % self.state_save_interval == 0:
                         progress = (processed_messages / total_messages) * 100
-                        print(f"Progress: {progress:.1f}% ({processed_messages}/{total_messages})")
+                        logger.info(f"Progress: {progress:.1f}% ({processed_messages}/{total_messages})")
 
                 except Exception as e:
-                    print(f"Error processing message {message.id}: {e}")
+                    logger.error(f"Error processing message {message.id}: {e}")
 
             # Process remaining messages
             if message_batch:
                 await self.process_message_batch(message_batch, channel)
 
             # Download media files
+            if media_download:
+                await media_download
             if media_tasks:
                 await self.download_media_files(channel_username, media_tasks)
 
             # Update channel last scanned time
             channel.last_scanned = timezone.now()
-            channel.save()
+            await sync_to_async(channel.save)(update_fields=['last_scanned', 'updated_at'])
 
-            print(f"Completed scraping channel {channel_username}")
+            logger.info(f"Completed scraping channel {channel_username}")
 
         except Exception as e:
-            print(f"Error scraping channel {channel_username}: {e}")
+            logger.error(f"Error scraping channel {channel_username}: {e}")
+
+        finally:
+            # A batch may still be downloading if the scrape stopped part way
+            if media_download and not media_download.done():
+                await asyncio.gather(media_download, return_exceptions=True)
 
     async def process_message_batch(self, message_batch: List[MessageData], channel: TelegramChannel):
         """Process a batch of messages and save to database"""
+        # Build rows one by one so a single malformed message is skipped on its own
+        rows = []
+        built = []
         for msg_data in message_batch:
             try:
-                # Create or get TelegramMessage
-                telegram_message, created = TelegramMessage.objects.get_or_create(
+                rows.append(TelegramMessage(
                     channel=channel,
                     message_id=msg_data.message_id,
-                    defaults={
-                        'text': msg_data.message,
-                        'date': datetime.fromisoformat(msg_data.date.replace(' ', 'T')),
-                        'sender_id': msg_data.sender_id,
-                        'sender_username': msg_data.username or '',
-                        'is_forwarded': False,
-                        'forwarded_from': '',
-                        'media_type': msg_data.media_type or '',
-                        'file_path': msg_data.media_path or ''
-                    }
+                    text=msg_data.message,
+                    date=datetime.fromisoformat(msg_data.date.replace(' ', 'T')),
+                    sender_id=msg_data.sender_id,
+                    sender_username=msg_data.username or '',
+                    is_forwarded=False,
+                    forwarded_from='',
+                    media_type=msg_data.media_type or '',
+                    file_path=msg_data.media_path or ''
+                ))
+                built.append(msg_data)
+            except Exception as e:
+                logger.error(f"Error processing message {msg_data.message_id}: {e}")
+        
+        # Insert the batch at once; messages already stored are skipped by the
+        # (channel, message_id) unique constraint. If the batch insert fails, fall
+        # back to one insert per row so only the offending messages are lost.
+        def insert_batch():
+            try:
+                with transaction.atomic():
+                    TelegramMessage.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+                return built
+            except Exception as e:
+                logger.warning(f"Batch insert failed for channel {channel.username}, retrying per message: {e}")
+            
+            saved = []
+            for row, msg_data in zip(rows, built):
+                try:
+                    with transaction.atomic():
+                        TelegramMessage.objects.bulk_create([row], ignore_conflicts=True)
+                    saved.append(msg_data)
+                except Exception as e:
+                    logger.error(f"Error saving message {msg_data.message_id}: {e}")
+            return saved
+        
+        saved = await sync_to_async(insert_batch)()
+        
+        # Save raw message data to MinIO
+        if not self.minio_client:
+            return
+        
+        for msg_data in saved:
+            try:
+                message_dict = {
+                    'message_id': msg_data.message_id,
+                    'date': msg_data.date,
+                    'sender_id': msg_data.sender_id,
+                    'first_name': msg_data.first_name,
+                    'last_name': msg_data.last_name,
+                    'username': msg_data.username,
+                    'message': msg_data.message,
+                    'media_type': msg_data.media_type,
+                    'media_path': msg_data.media_path,
+                    'reply_to': msg_data.reply_to,
+                    'channel_id': msg_data.channel_id,
+                    'channel_name': msg_data.channel_name,
+                    'scraped_at': timezone.now().isoformat()
+                }
+                
+                await sync_to_async(self.minio_client.save_telegram_message)(
+                    message_dict,
+                    msg_data.channel_id,
+                    msg_data.message_id
                 )
-
-                # Save raw message data to MinIO
-                if self.minio_client:
-                    try:
-                        message_dict = {
-                            'message_id': msg_data.message_id,
-                            'date': msg_data.date,
-                            'sender_id': msg_data.sender_id,
-                            'first_name': msg_data.first_name,
-                            'last_name': msg_data.last_name,
-                            'username': msg_data.username,
-                            'message': msg_data.message,
-                            'media_type': msg_data.media_type,
-                            'media_path': msg_data.media_path,
-                            'reply_to': msg_data.reply_to,
-                            'channel_id': msg_data.channel_id,
-                            'channel_name': msg_data.channel_name,
-                            'scraped_at': timezone.now().isoformat()
-                        }
-                        
-                        self.minio_client.save_telegram_message(
-                            message_dict,
-                            msg_data.channel_id,
-                            msg_data.message_id
-                        )
-                        
-                    except Exception as e:
-                        print(f"Error saving to MinIO: {e}")
-
+                
             except Exception as e:
-                print(f"Error processing message {msg_data.message_id}: {e}")
+                logger.error(f"Error saving to MinIO: {e}")
 
     async def download_media_files(self, channel_name: str, media_tasks: List):
         """Download media files concurrently"""
@@ -300,7 +351,7 @@ class AutomatedTelegramScraper:
         completed_media = 0
         successful_downloads = 0
         
-        print(f"Downloading {total_media} media files...")
+        logger.info(f"Downloading {total_media} media files...")
         
         semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
         
@@ -320,24 +371,21 @@ class AutomatedTelegramScraper:
                     if media_path:
                         # Update message with media path
                         message = batch[j]
-                        try:
-                            telegram_message = TelegramMessage.objects.get(
-                                channel__username=channel_name,
-                                message_id=message.id
-                            )
-                            telegram_message.file_path = media_path
-                            telegram_message.save()
+                        updated = await sync_to_async(TelegramMessage.objects.filter(
+                            channel__username=channel_name,
+                            message_id=message.id
+                        ).update)(file_path=media_path)
+                        if updated:
                             successful_downloads += 1
-                        except TelegramMessage.DoesNotExist:
-                            pass
                 except Exception:
                     pass
                 
                 completed_media += 1
-                progress = (completed_media / total_media) * 100
-                print(f"Media progress: {progress:.1f}% ({completed_media}/{total_media})")
+                if completed_media % self.state_save_interval == 0 or completed_media == total_media:
+                    progress = (completed_media / total_media) * 100
+                    logger.info(f"Media progress: {progress:.1f}% ({completed_media}/{total_media})")
         
-        print(f"Media download complete! ({successful_downloads}/{total_media} successful)")
+        logger.info(f"Media download complete! ({successful_downloads}/{total_media} successful)")
 
     async def initialize_client(self):
         """Initialize Telegram client with stored session"""
@@ -351,14 +399,14 @@ class AutomatedTelegramScraper:
             await self.client.connect()
             
             if not await self.client.is_user_authorized():
-                print("Telegram client not authorized. Please run the interactive scraper first to authenticate.")
+                logger.warning("Telegram client not authorized. Please run the interactive scraper first to authenticate.")
                 return False
             
-            print("Telegram client initialized successfully")
+            logger.info("Telegram client initialized successfully")
             return True
             
         except Exception as e:
-            print(f"Failed to initialize Telegram client: {e}")
+            logger.error(f"Failed to initialize Telegram client: {e}")
             return False
 
     async def scrape_channels(self, channel_usernames: List[str]):
@@ -366,12 +414,22 @@ class AutomatedTelegramScraper:
         if not await self.initialize_client():
             raise Exception("Failed to initialize Telegram client")
         
-        try:
-            for i, channel_username in enumerate(channel_usernames, 1):
-                print(f"[{i}/{len(channel_usernames)}] Scraping channel: {channel_username}")
+        # Scrape several channels at once over the shared client; the semaphore keeps
+        # the number of channels in flight under Telegram's rate limits
+        semaphore = asyncio.Semaphore(self.max_concurrent_channels)
+        
+        async def scrape_one(i, channel_username):
+            async with semaphore:
+                logger.info(f"[{i}/{len(channel_usernames)}] Scraping channel: {channel_username}")
                 await self.scrape_channel(channel_username)
+        
+        try:
+            await asyncio.gather(
+                *(scrape_one(i, username) for i, username in enumerate(channel_usernames, 1)),
+                return_exceptions=True
+            )
             
-            print(f"Completed scraping {len(channel_usernames)} channels")
+            logger.info(f"Completed scraping {len(channel_usernames)} channels")
             
         finally:
             if self.client:
@@ -382,13 +440,13 @@ class AutomatedTelegramScraper:
         if channel_usernames is None:
             # Get all active channels from database
             active_channels = TelegramChannel.objects.filter(is_active=True)
-            channel_usernames = list(active_channels.values_list('username', flat=True))
+            channel_usernames = await sync_to_async(list)(active_channels.values_list('username', flat=True))
         
         if not channel_usernames:
-            print("No channels to scrape")
+            logger.info("No channels to scrape")
             return
         
-        print(f"Starting automated scraping for {len(channel_usernames)} channels")
+        logger.info(f"Starting automated scraping for {len(channel_usernames)} channels")
         await self.scrape_channels(channel_usernames)
 
 # Convenience function for use in views
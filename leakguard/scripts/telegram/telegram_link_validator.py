@@ -25,6 +25,9 @@ class TelegramLinkValidator:
         self.api_hash = api_hash
         self.phone_number = phone_number
         self.client = None
+        # Username -> in-flight or finished get_entity lookup, so a channel listed
+        # more than once is resolved with a single RPC
+        self._entity_cache = {}
     
     async def start(self):
         """Initialize Telegram client"""
@@ -41,6 +44,23 @@ class TelegramLinkValidator:
         """Stop Telegram client"""
         if self.client:
             await self.client.disconnect()
+        self._entity_cache.clear()
+    
+    async def _get_entity(self, username: str):
+        """Resolve a username once per client, sharing concurrent lookups"""
+        key = username.lower()
+        lookup = self._entity_cache.get(key)
+        if lookup is None:
+            lookup = asyncio.ensure_future(self.client.get_entity(username))
+            self._entity_cache[key] = lookup
+        
+        try:
+            return await lookup
+        except Exception:
+            # Failures (private, not found, flood wait) are not cached
+            if self._entity_cache.get(key) is lookup:
+                del self._entity_cache[key]
+            raise
     
     async def validate_single_link(self, username: str) -> Dict[str, any]:
         """Validate a single Telegram link"""
@@ -57,7 +77,7 @@ class TelegramLinkValidator:
             clean_username = username.strip('@')
             
             # Try to get entity information
-            entity = await self.client.get_entity(clean_username)
+            entity = await self._get_entity(clean_username)
             
             # Extract channel information
             channel_info = {
@@ -210,8 +230,8 @@ class TelegramLinkValidator:
         return summary
 
 # Convenience function for use in views
-async def validate_telegram_links(links: List[Dict[str, str]], api_id: int, api_hash: str, phone_number: str) -> List[Dict[str, any]]:
-    """Validate a list of Telegram links"""
+async def validate_telegram_links(links: List[Dict[str, str]], api_id: int, api_hash: str, phone_number: str, max_concurrent: int = 20) -> List[Dict[str, any]]:
+    """Validate a list of Telegram links, at most max_concurrent at a time over one client"""
     validator = TelegramLinkValidator(api_id, api_hash, phone_number)
     
     try:
@@ -220,7 +240,7 @@ async def validate_telegram_links(links: List[Dict[str, str]], api_id: int, api_
             return []
         
         # Validate all links
-        results = await validator.validate_links_batch(links)
+        results = await validator.validate_links_batch(links, max_concurrent=max_concurrent)
         
         # Return only active links
         active_links = validator.filter_active_links(results)
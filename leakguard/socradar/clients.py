@@ -0,0 +1,95 @@
+"""
+Shared storage and HTTP clients for LeakGuard
+
+Clients are created lazily, once per process, so their connection pools
+are reused across requests and Celery tasks.
+"""
+
+import decimal
+import threading
+
+import orjson
+
+_minio = None
+_os = None
+_http = None
+_clients_lock = threading.Lock()
+
+
+class OrjsonSerializer:
+    """OpenSearch request/response serializer backed by orjson"""
+    
+    mimetype = 'application/json'
+    
+    def loads(self, s):
+        return orjson.loads(s)
+    
+    def dumps(self, data):
+        # Bodies that are already serialized are sent as they are
+        if isinstance(data, str):
+            return data
+        return orjson.dumps(data, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    @staticmethod
+    def default(obj):
+        if isinstance(obj, decimal.Decimal):
+            return float(obj)
+        raise TypeError(f"Unable to serialize {obj!r} (type: {type(obj)})")
+
+
+def opensearch_connection_options():
+    """Connection settings shared by every OpenSearch client in the project"""
+    from opensearchpy import RequestsHttpConnection
+    
+    return {
+        'connection_class': RequestsHttpConnection,
+        'pool_maxsize': 32,
+        'http_compress': True,
+        'serializer': OrjsonSerializer(),
+    }
+
+
+def get_minio():
+    """Return the process-wide MinIO client"""
+    global _minio
+    if _minio is None:
+        with _clients_lock:
+            if _minio is None:
+                from scripts.storage.minio_client import LeakGuardMinioClient
+                _minio = LeakGuardMinioClient()
+    return _minio
+
+
+def get_opensearch():
+    """Return the process-wide OpenSearch client"""
+    global _os
+    if _os is None:
+        with _clients_lock:
+            if _os is None:
+                from config.opensearch_config import OPENSEARCH_CONFIG
+                from opensearchpy import OpenSearch
+                
+                config = {**opensearch_connection_options(), **OPENSEARCH_CONFIG}
+                _os = OpenSearch(**config)
+    return _os
+
+
+def get_http_session():
+    """Return the process-wide requests session for outbound HTTP fetches
+    
+    Keep-alive connections are reused between calls, and transient failures
+    (429 and 5xx) are retried with backoff.
+    """
+    global _http
+    if _http is None:
+        with _clients_lock:
+            if _http is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util import Retry
+                
+                session = requests.Session()
+                retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+                session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry))
+                _http = session
+    return _http
@@ -20,6 +20,12 @@ from scripts.storage.minio_client import LeakGuardMinioClient
 
 logger = logging.getLogger(__name__)
 
+# email:password pairs separated by any of : | , ; (passwords of 4+ characters)
+CREDENTIAL_PATTERN = re.compile(
+    r'([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})\s*[:|,;]\s*(\S{4,})',
+    re.IGNORECASE
+)
+
 class FileProcessor:
     """Processes files downloaded from Telegram channels"""
     
@@ -237,31 +243,17 @@ class FileProcessor:
             else:
                 extracted[data_type] = list(set(matches))
         
-        # Extract credential pairs (email:password format)
-        credential_patterns = [
-            r'([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})\s*[:|]\s*([^\s\n\r]+)',
-            r'([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})\s*[,;]\s*([^\s\n\r]+)',
-        ]
-        
-        for pattern in credential_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for email, password in matches:
-                if len(password.strip()) > 3:  # Basic password length check
-                    extracted['credentials'].append({
-                        'email': email.strip(),
-                        'password': password.strip(),
-                        'source': 'regex_extraction'
-                    })
-        
-        # Remove duplicates from credentials
+        # Extract credential pairs (email:password format) in one pass, skipping duplicates
         seen = set()
-        unique_credentials = []
-        for cred in extracted['credentials']:
-            key = (cred['email'], cred['password'])
+        for match in CREDENTIAL_PATTERN.finditer(content):
+            key = match.group(1, 2)
             if key not in seen:
                 seen.add(key)
-                unique_credentials.append(cred)
-        extracted['credentials'] = unique_credentials
+                extracted['credentials'].append({
+                    'email': key[0],
+                    'password': key[1],
+                    'source': 'regex_extraction'
+                })
         
         return extracted
     
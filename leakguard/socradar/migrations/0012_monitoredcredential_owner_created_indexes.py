@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socradar', '0011_processedfile_extractedcredential_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='monitoredcredential',
+            index=models.Index(fields=['owner', '-created_at'], name='mc_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='monitoredcredential',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['owner', '-created_at'], name='mc_owner_active_created_idx'),
+        ),
+    ]
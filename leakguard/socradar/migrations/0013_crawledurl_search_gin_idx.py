@@ -0,0 +1,17 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socradar', '0012_monitoredcredential_owner_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='crawledurl',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('username', 'channel_name', 'description', config='simple'), name='crawledurl_search_gin_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socradar', '0013_crawledurl_search_gin_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='telegrammessage',
+            index=models.Index(fields=['-created_at'], name='tm_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='telegrammessage',
+            index=models.Index(fields=['channel', '-created_at'], name='tm_channel_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='telegramlink',
+            index=models.Index(condition=models.Q(('is_suspicious', True)), fields=['-created_at'], name='tl_susp_created_idx'),
+        ),
+    ]
@@ -2,6 +2,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 
 # ✅ Define a shared enum for credential kinds
 class CredentialKind(models.TextChoices):
@@ -39,6 +41,15 @@ class MonitoredCredential(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', '-created_at'], name='mc_owner_created_idx'),
+            models.Index(
+                fields=['owner', '-created_at'],
+                name='mc_owner_active_created_idx',
+                condition=models.Q(is_active=True),
+            ),
+        ]
 
     def __str__(self):
         # Return the primary credential value based on type
@@ -180,6 +191,10 @@ class TelegramMessage(models.Model):
     class Meta:
         unique_together = ['channel', 'message_id']
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['-created_at'], name='tm_created_idx'),
+            models.Index(fields=['channel', '-created_at'], name='tm_channel_created_idx'),
+        ]
 
     def __str__(self):
         return f"Message {self.message_id} from {self.channel.username}"
@@ -244,6 +259,11 @@ class TelegramLink(models.Model):
             models.Index(fields=['validation_status']),
             models.Index(fields=['created_at']),
             models.Index(fields=['is_suspicious']),
+            models.Index(
+                fields=['-created_at'],
+                name='tl_susp_created_idx',
+                condition=models.Q(is_suspicious=True),
+            ),
         ]
     
     def __str__(self):
@@ -339,10 +359,21 @@ class CrawledURL(models.Model):
     class Meta:
         unique_together = ['username', 'crawl_session_id']
         ordering = ['-crawled_at']
+        indexes = [
+            GinIndex(
+                SearchVector('username', 'channel_name', 'description', config='simple'),
+                name='crawledurl_search_gin_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"@{self.username} - {self.source}"
 
+    @staticmethod
+    def search_vector():
+        """Full-text search vector matching the GIN index expression"""
+        return SearchVector('username', 'channel_name', 'description', config='simple')
+
     @property
     def telegram_channel_url(self):
         """Return the Telegram channel URL for easy access"""
@@ -4,13 +4,18 @@ Handles indexing and searching of extracted credentials
 """
 
 import logging
+import threading
 from typing import Dict, List, Any, Optional
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# How long a search point in time stays open between result pages
+SEARCH_PIT_KEEP_ALIVE = '5m'
+
 class LeakGuardOpenSearchClient:
     """Client for interacting with OpenSearch"""
     
@@ -24,6 +29,7 @@ class LeakGuardOpenSearchClient:
         """Initialize OpenSearch client"""
         try:
             from opensearchpy import OpenSearch
+            from .clients import opensearch_connection_options
             
             # Get OpenSearch configuration from Django settings
             opensearch_hosts = getattr(settings, 'OPENSEARCH_DSL', {}).get('default', {}).get('hosts', ['localhost:9200'])
@@ -35,6 +41,7 @@ class LeakGuardOpenSearchClient:
                 verify_certs=False,
                 ssl_assert_hostname=False,
                 ssl_show_warn=False,
+                **opensearch_connection_options()
             )
             
             # Test connection
@@ -49,13 +56,29 @@ class LeakGuardOpenSearchClient:
             self.client = None
     
     def is_available(self) -> bool:
-        """Check if OpenSearch is available"""
+        """Check if OpenSearch is available
+        
+        The ping result is cached for a few seconds so the check does not add a
+        round trip to every request. Failures are cached for less time, so
+        recovery is noticed quickly.
+        """
         if not self.client:
             return False
         try:
-            return self.client.ping()
-        except:
-            return False
+            available = cache.get('os_up')
+        except Exception:
+            # The cache being down must not take the health check with it
+            available = None
+        if available is None:
+            try:
+                available = self.client.ping()
+            except Exception:
+                available = False
+            try:
+                cache.set('os_up', available, 10 if available else 2)
+            except Exception:
+                pass
+        return available
     
     def create_indices(self):
         """Create OpenSearch indices"""
@@ -89,7 +112,9 @@ class LeakGuardOpenSearchClient:
             from .models import ExtractedCredential
             from .documents import CredentialDocument
             
-            credential = ExtractedCredential.objects.get(id=credential_id)
+            credential = ExtractedCredential.objects.select_related(
+                'message__channel', 'processed_file'
+            ).get(id=credential_id)
             doc = CredentialDocument()
             doc.meta.id = credential.id
             doc.meta.index = self.index_name
@@ -148,7 +173,7 @@ class LeakGuardOpenSearchClient:
             from .models import ProcessedFile
             from .documents import ProcessedFileDocument
             
-            processed_file = ProcessedFile.objects.get(id=processed_file_id)
+            processed_file = ProcessedFile.objects.select_related('message__channel').get(id=processed_file_id)
             doc = ProcessedFileDocument()
             doc.meta.id = processed_file.id
             doc.meta.index = self.file_index_name
@@ -197,89 +222,138 @@ class LeakGuardOpenSearchClient:
             logger.error(f"Error indexing processed file {processed_file_id}: {e}")
             return False
     
+    @staticmethod
+    def build_search_body(query: str, filters: Dict[str, Any] = None, size: int = 20, from_: int = 0,
+                          pit_id: Optional[str] = None, search_after: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """Build the search request body for a credential query
+        
+        With a pit_id the search runs against that point in time, and
+        search_after continues from the sort values of the previous page.
+        """
+        # Build search query
+        search_body = {
+            'query': {
+                'bool': {
+                    'must': [],
+                    'filter': []
+                }
+            },
+            'sort': [
+                {'extracted_at': {'order': 'desc'}},
+                {'_score': {'order': 'desc'}},
+                {'id': {'order': 'asc'}}  # Tiebreaker so search_after is stable
+            ],
+            'size': size,
+            'from': from_
+        }
+        
+        if pit_id:
+            search_body['pit'] = {'id': pit_id, 'keep_alive': SEARCH_PIT_KEEP_ALIVE}
+        if search_after:
+            search_body['search_after'] = search_after
+        
+        # Add text search
+        if query:
+            # Check if query looks like a domain
+            if '.' in query and not '@' in query:
+                # Domain search - use wildcard match for partial domain matching
+                search_body['query']['bool']['must'].append({
+                    'wildcard': {
+                        'domain.keyword': f'*{query}*'
+                    }
+                })
+            elif '@' in query:
+                # Email search - use exact match for email field
+                search_body['query']['bool']['must'].append({
+                    'term': {
+                        'email.keyword': query
+                    }
+                })
+            else:
+                # General text search - use wildcard matching for better results
+                search_body['query']['bool']['must'].append({
+                    'multi_match': {
+                        'query': query,
+                        'fields': [
+                            'email^3',
+                            'username^2',
+                            'domain^2',
+                            'channel_username^2',
+                            'file_name^2'
+                        ],
+                        'type': 'phrase_prefix',  # More precise than best_fields
+                        'fuzziness': '0'  # No fuzziness for exact matches
+                    }
+                })
+        else:
+            # If no query, match all
+            search_body['query']['bool']['must'].append({'match_all': {}})
+        
+        # Add filters
+        if filters:
+            for field, value in filters.items():
+                if value is not None and value != '':
+                    if field == 'risk_level':
+                        search_body['query']['bool']['filter'].append({
+                            'term': {field: value}
+                        })
+                    elif field == 'domain':
+                        search_body['query']['bool']['filter'].append({
+                            'wildcard': {f'{field}.keyword': f'*{value}*'}
+                        })
+                    elif field == 'channel_username':
+                        search_body['query']['bool']['filter'].append({
+                            'term': {f'{field}.keyword': value}
+                        })
+                    elif field == 'date_range':
+                        if 'from' in value or 'to' in value:
+                            date_filter = {'range': {'extracted_at': {}}}
+                            if 'from' in value:
+                                date_filter['range']['extracted_at']['gte'] = value['from']
+                            if 'to' in value:
+                                date_filter['range']['extracted_at']['lte'] = value['to']
+                            search_body['query']['bool']['filter'].append(date_filter)
+        
+        return search_body
+    
+    @staticmethod
+    def format_search_response(response: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a raw credential search response into result rows"""
+        # Process results
+        hits = response['hits']['hits']
+        results = {
+            'total': response['hits']['total']['value'],
+            'hits': [],
+            'aggregations': {},
+            'search_after': hits[-1].get('sort') if hits else None
+        }
+        
+        for hit in hits:
+            source = hit['_source']
+            results['hits'].append({
+                'id': hit['_id'],
+                'score': hit['_score'],
+                'email': source.get('email', ''),
+                'username': source.get('username', ''),
+                'password': source.get('password', ''),
+                'domain': source.get('domain', ''),
+                'risk_level': source.get('risk_level', 'LOW'),
+                'risk_score': source.get('risk_score', 0),
+                'channel_username': source.get('channel_username', ''),
+                'file_name': source.get('file_name', ''),
+                'extracted_at': source.get('extracted_at', ''),
+                'message_date': source.get('message_date', ''),
+            })
+        
+        return results
+    
     def search_credentials(self, query: str, filters: Dict[str, Any] = None, size: int = 20, from_: int = 0) -> Dict[str, Any]:
         """Search credentials in OpenSearch"""
         if not self.is_available():
             return {'error': 'OpenSearch not available'}
         
         try:
-            # Build search query
-            search_body = {
-                'query': {
-                    'bool': {
-                        'must': [],
-                        'filter': []
-                    }
-                },
-                'sort': [
-                    {'extracted_at': {'order': 'desc'}},
-                    {'_score': {'order': 'desc'}}
-                ],
-                'size': size,
-                'from': from_
-            }
-            
-            # Add text search
-            if query:
-                # Check if query looks like a domain
-                if '.' in query and not '@' in query:
-                    # Domain search - use wildcard match for partial domain matching
-                    search_body['query']['bool']['must'].append({
-                        'wildcard': {
-                            'domain.keyword': f'*{query}*'
-                        }
-                    })
-                elif '@' in query:
-                    # Email search - use exact match for email field
-                    search_body['query']['bool']['must'].append({
-                        'term': {
-                            'email.keyword': query
-                        }
-                    })
-                else:
-                    # General text search - use wildcard matching for better results
-                    search_body['query']['bool']['must'].append({
-                        'multi_match': {
-                            'query': query,
-                            'fields': [
-                                'email^3',
-                                'username^2',
-                                'domain^2',
-                                'channel_username^2',
-                                'file_name^2'
-                            ],
-                            'type': 'phrase_prefix',  # More precise than best_fields
-                            'fuzziness': '0'  # No fuzziness for exact matches
-                        }
-                    })
-            else:
-                # If no query, match all
-                search_body['query']['bool']['must'].append({'match_all': {}})
-            
-            # Add filters
-            if filters:
-                for field, value in filters.items():
-                    if value is not None and value != '':
-                        if field == 'risk_level':
-                            search_body['query']['bool']['filter'].append({
-                                'term': {field: value}
-                            })
-                        elif field == 'domain':
-                            search_body['query']['bool']['filter'].append({
-                                'wildcard': {f'{field}.keyword': f'*{value}*'}
-                            })
-                        elif field == 'channel_username':
-                            search_body['query']['bool']['filter'].append({
-                                'term': {f'{field}.keyword': value}
-                            })
-                        elif field == 'date_range':
-                            if 'from' in value or 'to' in value:
-                                date_filter = {'range': {'extracted_at': {}}}
-                                if 'from' in value:
-                                    date_filter['range']['extracted_at']['gte'] = value['from']
-                                if 'to' in value:
-                                    date_filter['range']['extracted_at']['lte'] = value['to']
-                                search_body['query']['bool']['filter'].append(date_filter)
+            search_body = self.build_search_body(query, filters, size, from_)
             
             # Execute search
             response = self.client.search(
@@ -287,90 +361,76 @@ class LeakGuardOpenSearchClient:
                 body=search_body
             )
             
-            # Process results
-            results = {
-                'total': response['hits']['total']['value'],
-                'hits': [],
-                'aggregations': {}
-            }
-            
-            for hit in response['hits']['hits']:
-                source = hit['_source']
-                results['hits'].append({
-                    'id': hit['_id'],
-                    'score': hit['_score'],
-                    'email': source.get('email', ''),
-                    'username': source.get('username', ''),
-                    'password': source.get('password', ''),
-                    'domain': source.get('domain', ''),
-                    'risk_level': source.get('risk_level', 'LOW'),
-                    'risk_score': source.get('risk_score', 0),
-                    'channel_username': source.get('channel_username', ''),
-                    'file_name': source.get('file_name', ''),
-                    'extracted_at': source.get('extracted_at', ''),
-                    'message_date': source.get('message_date', ''),
-                })
-            
-            return results
+            return self.format_search_response(response)
             
         except Exception as e:
             logger.error(f"Error searching credentials: {e}")
             return {'error': str(e)}
     
+    @staticmethod
+    def build_aggregations_body() -> Dict[str, Any]:
+        """Build the search request body for dashboard aggregations"""
+        search_body = {
+            'size': 0,
+            'aggs': {
+                'total_credentials': {
+                    'value_count': {
+                        'field': 'id'
+                    }
+                },
+                'risk_levels': {
+                    'terms': {
+                        'field': 'risk_level.keyword',
+                        'size': 10
+                    }
+                },
+                'domains': {
+                    'terms': {
+                        'field': 'domain.keyword',
+                        'size': 20
+                    }
+                },
+                'channels': {
+                    'terms': {
+                        'field': 'channel_username.keyword',
+                        'size': 20
+                    }
+                },
+                'daily_stats': {
+                    'date_histogram': {
+                        'field': 'extracted_at',
+                        'calendar_interval': 'day',
+                        'min_doc_count': 1
+                    }
+                }
+            }
+        }
+        
+        return search_body
+    
+    @staticmethod
+    def format_aggregations(response: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract dashboard statistics from a raw aggregations response"""
+        return {
+            'total_credentials': response['aggregations']['total_credentials']['value'],
+            'risk_levels': response['aggregations']['risk_levels']['buckets'],
+            'domains': response['aggregations']['domains']['buckets'],
+            'channels': response['aggregations']['channels']['buckets'],
+            'daily_stats': response['aggregations']['daily_stats']['buckets']
+        }
+    
     def get_aggregations(self) -> Dict[str, Any]:
         """Get aggregations for dashboard statistics"""
         if not self.is_available():
             return {'error': 'OpenSearch not available'}
         
         try:
-            search_body = {
-                'size': 0,
-                'aggs': {
-                    'total_credentials': {
-                        'value_count': {
-                            'field': 'id'
-                        }
-                    },
-                    'risk_levels': {
-                        'terms': {
-                            'field': 'risk_level.keyword',
-                            'size': 10
-                        }
-                    },
-                    'domains': {
-                        'terms': {
-                            'field': 'domain.keyword',
-                            'size': 20
-                        }
-                    },
-                    'channels': {
-                        'terms': {
-                            'field': 'channel_username.keyword',
-                            'size': 20
-                        }
-                    },
-                    'daily_stats': {
-                        'date_histogram': {
-                            'field': 'extracted_at',
-                            'calendar_interval': 'day',
-                            'min_doc_count': 1
-                        }
-                    }
-                }
-            }
-            
             response = self.client.search(
                 index=self.index_name,
-                body=search_body
+                body=self.build_aggregations_body()
             )
             
-            return {
-                'total_credentials': response['aggregations']['total_credentials']['value'],
-                'risk_levels': response['aggregations']['risk_levels']['buckets'],
-                'domains': response['aggregations']['domains']['buckets'],
-                'channels': response['aggregations']['channels']['buckets'],
-                'daily_stats': response['aggregations']['daily_stats']['buckets']
-            }
+            return self.format_aggregations(response)
             
         except Exception as e:
             logger.error(f"Error getting aggregations: {e}")
@@ -382,75 +442,104 @@ class LeakGuardOpenSearchClient:
             return {'error': 'OpenSearch not available'}
         
         try:
+            from opensearchpy import helpers
             from .models import ExtractedCredential
             from .documents import CredentialDocument
             
-            credentials = ExtractedCredential.objects.filter(id__in=credential_ids)
+            # Join message, channel and file up front (the prepare_* methods read them) and
+            # stream rows instead of materialising the whole batch
+            credentials = ExtractedCredential.objects.filter(
+                id__in=credential_ids
+            ).select_related(
+                'message__channel', 'processed_file'
+            ).defer('message__text').iterator(chunk_size=1000)
             
-            bulk_data = []
-            for credential in credentials:
-                doc = CredentialDocument()
-                
-                # Prepare document data
-                doc_data = {
-                    'email': doc.prepare_email(credential),
-                    'username': doc.prepare_username(credential),
-                    'password': doc.prepare_password(credential),
-                    'domain': doc.prepare_domain(credential),
-                    'ip_address': doc.prepare_ip_address(credential),
-                    'phone': doc.prepare_phone(credential),
-                    'credit_card': doc.prepare_credit_card(credential),
-                    'ssn': doc.prepare_ssn(credential),
-                    'extraction_method': doc.prepare_extraction_method(credential),
-                    'confidence_score': doc.prepare_confidence_score(credential),
-                    'is_verified': doc.prepare_is_verified(credential),
-                    'risk_level': doc.prepare_risk_level(credential),
-                    'channel_username': doc.prepare_channel_username(credential),
-                    'channel_name': doc.prepare_channel_name(credential),
-                    'message_id': doc.prepare_message_id(credential),
-                    'file_name': doc.prepare_file_name(credential),
-                    'file_size': doc.prepare_file_size(credential),
-                    'file_mime_type': doc.prepare_file_mime_type(credential),
-                    'risk_score': doc.prepare_risk_score(credential),
-                    'is_sensitive': doc.prepare_is_sensitive(credential),
-                    'extracted_at': doc.prepare_extracted_at(credential),
-                    'message_date': doc.prepare_message_date(credential),
-                    'file_processed_at': doc.prepare_file_processed_at(credential),
-                    'content': doc.prepare_content(credential),
-                    'id': credential.id,
-                    'created_at': credential.created_at,
-                    'updated_at': credential.updated_at,
-                }
-                
-                # Add to bulk data
-                bulk_data.append({
-                    'index': {
+            doc = CredentialDocument()
+            
+            def actions():
+                for credential in credentials:
+                    # Prepare document data
+                    doc_data = {
+                        'email': doc.prepare_email(credential),
+                        'username': doc.prepare_username(credential),
+                        'password': doc.prepare_password(credential),
+                        'domain': doc.prepare_domain(credential),
+                        'ip_address': doc.prepare_ip_address(credential),
+                        'phone': doc.prepare_phone(credential),
+                        'credit_card': doc.prepare_credit_card(credential),
+                        'ssn': doc.prepare_ssn(credential),
+                        'extraction_method': doc.prepare_extraction_method(credential),
+                        'confidence_score': doc.prepare_confidence_score(credential),
+                        'is_verified': doc.prepare_is_verified(credential),
+                        'risk_level': doc.prepare_risk_level(credential),
+                        'channel_username': doc.prepare_channel_username(credential),
+                        'channel_name': doc.prepare_channel_name(credential),
+                        'message_id': doc.prepare_message_id(credential),
+                        'file_name': doc.prepare_file_name(credential),
+                        'file_size': doc.prepare_file_size(credential),
+                        'file_mime_type': doc.prepare_file_mime_type(credential),
+                        'risk_score': doc.prepare_risk_score(credential),
+                        'is_sensitive': doc.prepare_is_sensitive(credential),
+                        'extracted_at': doc.prepare_extracted_at(credential),
+                        'message_date': doc.prepare_message_date(credential),
+                        'file_processed_at': doc.prepare_file_processed_at(credential),
+                        'content': doc.prepare_content(credential),
+                        'id': credential.id,
+                        'created_at': credential.created_at,
+                        'updated_at': credential.updated_at,
+                    }
+                    
+                    # Upsert so re-syncing an unchanged credential is a no-op on the cluster
+                    yield {
+                        '_op_type': 'update',
                         '_index': self.index_name,
-                        '_id': credential.id
+                        '_id': credential.id,
+                        'doc': doc_data,
+                        'doc_as_upsert': True,
                     }
-                })
-                bulk_data.append(doc_data)
             
-            # Execute bulk index
-            if bulk_data:
-                response = self.client.bulk(body=bulk_data)
-                
-                # Check for errors
-                errors = [item for item in response['items'] if 'error' in item.get('index', {})]
-                
-                return {
-                    'success': True,
-                    'indexed': len(credentials),
-                    'errors': len(errors),
-                    'error_details': errors if errors else None
-                }
-            else:
-                return {'success': True, 'indexed': 0, 'errors': 0}
+            # Execute bulk index in the calling thread, so the queryset above is read
+            # on the caller's database connection. Callers that want several batches
+            # in flight (bulk_index_existing_data) run this method concurrently.
+            indexed_count = 0
+            errors = []
+            for ok, item in helpers.streaming_bulk(
+                self.client,
+                actions(),
+                chunk_size=1000,
+                raise_on_error=False,
+                raise_on_exception=False,
+            ):
+                if ok:
+                    indexed_count += 1
+                else:
+                    errors.append(item)
+            
+            return {
+                'success': True,
+                'indexed': indexed_count,
+                'errors': len(errors),
+                'error_details': errors if errors else None
+            }
                 
         except Exception as e:
             logger.error(f"Error bulk indexing credentials: {e}")
             return {'error': str(e)}
 
+
+_client = None
+_client_lock = threading.Lock()
+
+
 def get_opensearch_client() -> LeakGuardOpenSearchClient:
-    """Get OpenSearch client instance"""
-    return LeakGuardOpenSearchClient()
+    """Get the process-wide OpenSearch client instance
+    
+    The instance, and its connection pool, is reused across calls. It is
+    rebuilt only if the previous attempt could not connect.
+    """
+    global _client
+    if _client is None or _client.client is None:
+        with _client_lock:
+            if _client is None or _client.client is None:
+                _client = LeakGuardOpenSearchClient()
+    return _client
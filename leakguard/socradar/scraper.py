@@ -121,15 +121,28 @@ class TelegramScraper:
             if progress_callback:
                 progress_callback(0, total_count, 0, f"Found {total_count} messages to process")
             
+            # Message IDs already stored for this channel, loaded in one query so known
+            # messages are skipped instead of each failing an INSERT. Streamed through a
+            # server-side cursor so a full rescan never holds the rows twice
+            existing_ids = await sync_to_async(lambda: set(
+                TelegramMessage.objects.filter(
+                    channel=channel, message_id__gt=offset_id
+                ).values_list('message_id', flat=True).iterator(chunk_size=50000)
+            ))()
+            
             # Scrape messages
             async for message in self.client.iter_messages(entity, offset_id=offset_id, reverse=True):
+                if message.id in existing_ids:
+                    last_message_id = message.id
+                    continue
+                
                 try:
                     # Create message record
                     message_obj = await sync_to_async(TelegramMessage.objects.create)(
                         channel=channel,
                         message_id=message.id,
                         date=message.date,
-                        sender_id=getattr(message.sender, 'id', None) if message.sender else None,
+                        sender_id=message.sender_id,
                         sender_username=getattr(message.sender, 'username', '') if message.sender else '',
                         text=message.text or '',
                         is_forwarded=bool(message.fwd_from),
@@ -178,11 +191,6 @@ class TelegramScraper:
             if progress_callback:
                 progress_callback(messages_count, total_count, files_count, f"Completed processing {messages_count} messages")
             
-            # Update channel statistics
-            link_count = await sync_to_async(TelegramMessage.objects.filter(channel=channel).count)()
-            channel.link_count = link_count
-            await sync_to_async(channel.save)()
-            
             logger.info(f"Completed scraping @{channel_username}: {messages_count} messages, {files_count} files")
             
             return {
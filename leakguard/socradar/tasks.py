@@ -9,10 +9,15 @@ import logging
 from celery import shared_task
 from django.utils import timezone
 from django.conf import settings
+from django.core.cache import cache
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Parsed Telegram links from the GitHub list, reused between collection runs
+GITHUB_LINKS_CACHE_KEY = 'github:telegram_links'
+GITHUB_LINKS_CACHE_TTL = 600  # seconds
+
 @shared_task(bind=True)
 def scrape_channel_task(self, channel_id, channel_username, last_scraped_msg_id=0, requested_by=None):
     """
@@ -38,7 +43,7 @@ def scrape_channel_task(self, channel_id, channel_username, last_scraped_msg_id=
         # Update channel status
         channel.scraping_status = 'RUNNING'
         channel.scraping_error = None
-        channel.save()
+        channel.save(update_fields=['scraping_status', 'scraping_error', 'updated_at'])
         
         # Progress tracking variables
         total_messages = 0
@@ -139,7 +144,7 @@ def scrape_channel_task(self, channel_id, channel_username, last_scraped_msg_id=
             channel.last_scraped_msg_id = result.get('last_message_id', last_scraped_msg_id)
             channel.last_scanned = timezone.now()
             channel.scraping_error = None
-            channel.save()
+            channel.save(update_fields=['scraping_status', 'last_scraped_msg_id', 'last_scanned', 'scraping_error', 'updated_at'])
             
             # Final success update
             if self.request.id:
@@ -164,7 +169,7 @@ def scrape_channel_task(self, channel_id, channel_username, last_scraped_msg_id=
             # Update channel with error
             channel.scraping_status = 'FAILED'
             channel.scraping_error = result.get('error', 'Unknown error')
-            channel.save()
+            channel.save(update_fields=['scraping_status', 'scraping_error', 'updated_at'])
             
             # Don't use FAILURE state, return error in result
             pass
@@ -182,7 +187,7 @@ def scrape_channel_task(self, channel_id, channel_username, last_scraped_msg_id=
             channel = TelegramChannel.objects.get(id=channel_id)
             channel.scraping_status = 'FAILED'
             channel.scraping_error = str(e)
-            channel.save()
+            channel.save(update_fields=['scraping_status', 'scraping_error', 'updated_at'])
         except:
             pass
         
@@ -453,3 +458,234 @@ def process_scraped_files():
     except Exception as e:
         logger.error(f"Error in process_scraped_files: {str(e)}")
         return f"Error: {str(e)}"
+
+
+@shared_task
+def process_telegram_links_task():
+    """Run the process_telegram_links management command off the request thread"""
+    try:
+        from django.core.management import call_command
+        
+        call_command('process_telegram_links')
+        
+        logger.info("Processed Telegram links")
+        return "Processed Telegram links"
+        
+    except Exception as e:
+        logger.error(f"Error in process_telegram_links_task: {str(e)}")
+        return f"Error: {str(e)}"
+
+
+@shared_task
+def revalidate_rate_limited_channels_task():
+    """Revalidate channels whose last validation hit a Telegram flood wait
+    
+    Request handlers fail fast on flood waits; this task sleeps them off and
+    retries instead.
+    """
+    try:
+        from .models import TelegramChannel
+        from .utils import FLOOD_WAIT_RETRIES, validate_telegram_channels
+        
+        channels = list(TelegramChannel.objects.filter(validation_status='FLOODWAIT').only(
+            'id', 'username', 'validation_status', 'validation_date', 'validation_error', 'is_active', 'updated_at'
+        ))
+        if not channels:
+            return "No rate-limited channels to revalidate"
+        
+        results = validate_telegram_channels(
+            [channel.username for channel in channels], flood_wait_retries=FLOOD_WAIT_RETRIES
+        )
+        
+        now = timezone.now()
+        for channel in channels:
+            result = results[channel.username]
+            channel.validation_status = result['status']
+            channel.validation_date = now
+            channel.validation_error = result.get('error', '')
+            channel.is_active = result['is_active']
+            channel.updated_at = now  # bulk_update skips auto_now
+        TelegramChannel.objects.bulk_update(
+            channels,
+            ['validation_status', 'validation_date', 'validation_error', 'is_active', 'updated_at'],
+            batch_size=500
+        )
+        
+        logger.info(f"Revalidated {len(channels)} rate-limited channels")
+        return f"Revalidated {len(channels)} rate-limited channels"
+        
+    except Exception as e:
+        logger.error(f"Error in revalidate_rate_limited_channels_task: {str(e)}")
+        return f"Error: {str(e)}"
+
+
+@shared_task(bind=True)
+def auto_collect_telegram_task(self, user_id=None, force=False):
+    """
+    Celery task for automated Telegram collection from GitHub
+    
+    Extracts Telegram links from GitHub, validates them, and saves the active
+    ones to OpenSearch, CrawledURL and TelegramChannel.
+    
+    Args:
+        user_id: User ID who requested the collection
+        force: Refetch the GitHub list even if a cached copy exists
+    """
+    try:
+        # Import here to avoid circular imports
+        from .models import CrawledURL, TelegramChannel
+        from .clients import get_opensearch
+        from scripts.telegram.telegram_automation import GitHubLinkExtractor
+        from scripts.telegram.telegram_link_validator import validate_telegram_links
+        from scripts.storage.opensearch_url_service import OpenSearchURLService
+        
+        # Get Telegram credentials from settings or environment
+        api_id = getattr(settings, 'TELEGRAM_API_ID', None) or os.getenv('TELEGRAM_API_ID')
+        api_hash = getattr(settings, 'TELEGRAM_API_HASH', None) or os.getenv('TELEGRAM_API_HASH')
+        phone_number = getattr(settings, 'TELEGRAM_PHONE', None) or os.getenv('TELEGRAM_PHONE')
+        
+        if not all([api_id, api_hash, phone_number]):
+            return {
+                'status': 'FAILED',
+                'error': 'Telegram API credentials not configured. Please set TELEGRAM_API_ID, TELEGRAM_API_HASH, and TELEGRAM_PHONE in settings.'
+            }
+        
+        # Step 1: Extract Telegram links from GitHub
+        if self.request.id:
+            self.update_state(state='PROGRESS', meta={'status': 'Fetching Telegram links from GitHub...', 'progress': 10})
+        
+        telegram_links = None if force else cache.get(GITHUB_LINKS_CACHE_KEY)
+        if telegram_links is None:
+            extractor = GitHubLinkExtractor()
+            telegram_links = extractor.fetch_telegram_links()
+            if telegram_links:
+                cache.set(GITHUB_LINKS_CACHE_KEY, telegram_links, GITHUB_LINKS_CACHE_TTL)
+        
+        if not telegram_links:
+            return {'status': 'SUCCESS', 'message': 'No Telegram links found on GitHub page.'}
+        
+        # Step 2: Validate links to check if they are active
+        if self.request.id:
+            self.update_state(state='PROGRESS', meta={'status': f'Validating {len(telegram_links)} links...', 'progress': 30})
+        
+        validated_links = asyncio.run(
+            validate_telegram_links(telegram_links, int(api_id), api_hash, phone_number)
+        )
+        
+        if not validated_links:
+            return {'status': 'SUCCESS', 'message': 'No active Telegram links found after validation.'}
+        
+        if self.request.id:
+            self.update_state(state='PROGRESS', meta={'status': 'Saving validated links...', 'progress': 70})
+        
+        # Generate unique crawl session ID
+        crawl_session_id = f"crawl_{timezone.now().strftime('%Y%m%d_%H%M%S')}"
+        
+        # Step 3: Save validated URLs to OpenSearch
+        opensearch_service = OpenSearchURLService()
+        opensearch_success = opensearch_service.save_crawled_urls(validated_links, crawl_session_id)
+        
+        # Step 4: Save validated URLs to Django database
+        django_urls_saved = 0
+        for link in validated_links:
+            crawled_url, created = CrawledURL.objects.get_or_create(
+                username=link['username'],
+                crawl_session_id=crawl_session_id,
+                defaults={
+                    'url': link['url'],
+                    'channel_name': link.get('channel_name', link['username']),
+                    'source': link.get('source', 'github'),
+                    'source_url': link.get('source_url', ''),
+                    'description': link.get('description', f'Auto-crawled from {link.get("source", "github")}'),
+                    'metadata': link.get('metadata', {}),
+                    'is_active': True
+                }
+            )
+            if created:
+                django_urls_saved += 1
+        
+        # Step 5: Add channels to TelegramChannel database
+        existing_usernames = set(TelegramChannel.objects.filter(
+            username__in=[link['username'] for link in validated_links]
+        ).values_list('username', flat=True))
+        
+        channels_to_create = {}
+        for link in validated_links:
+            if link['username'] in existing_usernames or link['username'] in channels_to_create:
+                continue
+            channels_to_create[link['username']] = TelegramChannel(
+                username=link['username'],
+                name=link.get('title', link['username']),
+                url=link['url'],
+                description=link.get('description', f'Auto-added from {link["source"]}'),
+                is_active=True
+            )
+        
+        TelegramChannel.objects.bulk_create(channels_to_create.values(), ignore_conflicts=True)
+        new_channels = list(TelegramChannel.objects.filter(username__in=list(channels_to_create)))
+        channels_added = len(new_channels)
+        
+        # Save new channels to OpenSearch as well, in a single bulk request
+        if new_channels:
+            from opensearchpy import helpers
+            
+            # Keyed by channel id, like the existing documents, and upserted so
+            # re-running a collection never duplicates a channel
+            actions = ({
+                '_op_type': 'update',
+                '_index': 'telegram-channels',
+                '_id': channel.id,
+                'doc_as_upsert': True,
+                'doc': {
+                    'id': channel.id,
+                    'name': channel.name,
+                    'username': channel.username,
+                    'url': channel.url,
+                    'description': channel.description,
+                    'is_active': channel.is_active,
+                    'created_at': channel.created_at.isoformat() if channel.created_at else None,
+                    'updated_at': channel.updated_at.isoformat() if channel.updated_at else None,
+                    'last_scanned': channel.last_scanned.isoformat() if channel.last_scanned else None,
+                    'crawl_session_id': crawl_session_id
+                }
+            } for channel in new_channels)
+            
+            try:
+                helpers.bulk(get_opensearch(), actions, chunk_size=500, request_timeout=30)
+            except Exception as e:
+                logger.warning(f"Failed to bulk index new Telegram channels to OpenSearch: {e}")
+        
+        # Prepare summary message with validation info
+        total_found = len(telegram_links)
+        active_found = len(validated_links)
+        inactive_count = total_found - active_found
+        
+        success_parts = []
+        if opensearch_success:
+            success_parts.append(f"Saved {active_found} active URLs to OpenSearch")
+        if django_urls_saved > 0:
+            success_parts.append(f"Saved {django_urls_saved} URLs to Django database")
+        if channels_added > 0:
+            success_parts.append(f"Added {channels_added} new Telegram channels")
+        
+        if success_parts:
+            message = f'Successfully completed auto-collection! {". ".join(success_parts)}.'
+            if inactive_count > 0:
+                message += f" ({inactive_count} inactive/expired links were filtered out.)"
+        else:
+            message = 'Auto-collection completed. All URLs were already in the database.'
+        
+        logger.info(f"Auto collection for user {user_id}: {message}")
+        
+        return {
+            'status': 'SUCCESS',
+            'message': message,
+            'total_found': total_found,
+            'active_found': active_found,
+            'urls_saved': django_urls_saved,
+            'channels_added': channels_added
+        }
+        
+    except Exception as e:
+        logger.error(f"Error in auto_collect_telegram_task: {str(e)}")
+        return {'status': 'FAILED', 'error': str(e)}
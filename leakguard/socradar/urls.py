@@ -13,6 +13,7 @@ urlpatterns = [
     path('telegram/', views.telegram_monitor, name='telegram_monitor'),
     path('telegram/process/', views.process_telegram_data, name='process_telegram_data'),
     path('telegram/auto-collect/', views.auto_telegram_collection, name='auto_telegram_collection'),
+    path('telegram/auto-collect/<str:task_id>/status/', views.auto_telegram_collection_status, name='auto_telegram_collection_status'),
     path('telegram/scrape/', views.start_telegram_scraping, name='start_telegram_scraping'),
     path('telegram/crawled-urls/', views.crawled_urls_investigation, name='crawled_urls_investigation'),
     path('investigate-alert/<int:alert_id>/', views.investigate_alert, name='investigate_alert'),
@@ -37,6 +37,24 @@ def extract_links_from_text(text: str) -> List[str]:
     return unique_urls
 
 
+# Hosts are matched exactly or as a parent domain, one set lookup per label,
+# so e.g. microsoft.com no longer counts as t.co
+TELEGRAM_DOMAINS = frozenset({'t.me', 'telegram.me', 'telegram.org'})
+SHORTENER_DOMAINS = frozenset({
+    'bit.ly', 'tinyurl.com', 'short.link', 'goo.gl', 't.co',
+    'is.gd', 'v.gd', 'ow.ly', 'buff.ly'
+})
+DIGIT_RUN_RE = re.compile(r'[0-9]{4,}')
+
+
+def _matches_domain(hostname: Optional[str], domains: frozenset) -> bool:
+    """Check whether hostname is one of domains or a subdomain of one"""
+    if not hostname:
+        return False
+    labels = hostname.split('.')
+    return any('.'.join(labels[i:]) in domains for i in range(len(labels) - 1))
+
+
 def is_telegram_link(url: str) -> bool:
     """
     Check if a URL is a Telegram link
@@ -47,15 +65,8 @@ def is_telegram_link(url: str) -> bool:
     Returns:
         True if it's a Telegram link, False otherwise
     """
-    telegram_domains = [
-        't.me', 'telegram.me', 'telegram.org',
-        'web.telegram.org', 'desktop.telegram.org'
-    ]
-    
     try:
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        return any(telegram_domain in domain for telegram_domain in telegram_domains)
+        return _matches_domain(urlparse(url).hostname, TELEGRAM_DOMAINS)
     except:
         return False
 
@@ -78,14 +89,11 @@ def calculate_risk_score(url: str, is_telegram: bool = False) -> int:
         domain = parsed.netloc.lower()
         
         # High-risk indicators
-        if any(suspicious in domain for suspicious in [
-            'bit.ly', 'tinyurl', 'short.link', 'goo.gl', 't.co',
-            'is.gd', 'v.gd', 'ow.ly', 'buff.ly'
-        ]):
+        if _matches_domain(parsed.hostname, SHORTENER_DOMAINS):
             risk_score += 30
         
         # Suspicious patterns
-        if re.search(r'[0-9]{4,}', domain):  # Many numbers in domain
+        if DIGIT_RUN_RE.search(domain):  # Many numbers in domain
             risk_score += 20
             
         if len(domain) > 50:  # Very long domain
@@ -207,7 +215,8 @@ def process_telegram_message_links(message: TelegramMessage) -> Dict[str, int]:
         link_obj = TelegramLink.objects.create(
             url=url,
             message=message,
-            channel=message.channel,
+            # Reuse the FK id so the channel row is not fetched per message
+            channel_id=message.channel_id,
             is_telegram_link=is_telegram,
             risk_score=risk_score,
             is_suspicious=risk_score > 50
@@ -332,27 +341,58 @@ def validate_telegram_channel(username: str) -> dict:
     Returns:
         Dict with validation results including status, title, member count, etc.
     """
+    return validate_telegram_channels([username])[username]
+
+
+# Background revalidation sleeps off flood waits up to this many seconds and
+# retries, at most FLOOD_WAIT_RETRIES times per channel
+FLOOD_WAIT_MAX_SECONDS = 60
+FLOOD_WAIT_RETRIES = 3
+
+
+def validate_telegram_channels(usernames: List[str], max_concurrent: int = 16,
+                               flood_wait_retries: int = 0) -> Dict[str, dict]:
+    """
+    Validate several Telegram channels concurrently over a single Telegram client
+    
+    Args:
+        usernames: Telegram channel usernames (without @)
+        max_concurrent: Maximum number of channel lookups in flight at once
+        flood_wait_retries: How many times to sleep off a short flood wait and retry.
+            Keep at 0 in request handlers so they fail fast with FLOODWAIT.
+        
+    Returns:
+        Dict mapping each username to its validation result
+        (same shape as validate_telegram_channel)
+    """
     import asyncio
     import os
     from django.conf import settings
     
+    if not usernames:
+        return {}
+    
     # Get API credentials from environment or Django settings
     api_id = os.getenv('TELEGRAM_API_ID')
     api_hash = os.getenv('TELEGRAM_API_HASH')
     
+    def same_result_for_all(result):
+        return {username: dict(result) for username in usernames}
+    
     # Check if credentials are properly set
     if not api_id or not api_hash or api_id == '' or api_hash == '':
         # Fallback to simple validation if no API credentials
-        return {
+        return same_result_for_all({
             'status': 'NO_API_CREDENTIALS',
             'is_active': False,
             'title': None,
             'members_count': None,
             'entity_type': None,
             'error': 'Telegram API credentials not configured'
-        }
+        })
     
-    async def check_channel():
+    async def check_channels():
+        client = None
         try:
             from telethon import TelegramClient, errors, functions, types
             
@@ -362,87 +402,112 @@ def validate_telegram_channel(username: str) -> dict:
             try:
                 await asyncio.wait_for(client.start(), timeout=10.0)
             except asyncio.TimeoutError:
-                return {
+                return same_result_for_all({
                     'status': 'AUTH_TIMEOUT',
                     'is_active': False,
                     'title': None,
                     'members_count': None,
                     'entity_type': None,
                     'error': 'Telegram authentication timeout - please authenticate manually first'
-                }
+                })
             except Exception as e:
-                return {
+                return same_result_for_all({
                     'status': 'AUTH_ERROR',
                     'is_active': False,
                     'title': None,
                     'members_count': None,
                     'entity_type': None,
                     'error': f'Authentication error: {str(e)}'
-                }
+                })
             
-            # Try to get channel info
-            try:
-                result = await client(functions.channels.GetFullChannelRequest(channel=username))
-                chat = result.chats[0] if result.chats else None
-                full = result.full_chat
-                
-                return {
-                    'status': 'PUBLIC_OK',
-                    'is_active': True,
-                    'title': getattr(chat, "title", None),
-                    'members_count': getattr(full, "participants_count", None),
-                    'entity_type': 'channel',
-                    'error': None
-                }
-                
-            except errors.UsernameNotOccupiedError:
-                return {
-                    'status': 'NOT_FOUND',
-                    'is_active': False,
-                    'title': None,
-                    'members_count': None,
-                    'entity_type': None,
-                    'error': 'Channel not found'
-                }
-                
-            except errors.FloodWaitError as e:
-                return {
-                    'status': 'FLOODWAIT',
-                    'is_active': False,
-                    'title': None,
-                    'members_count': None,
-                    'entity_type': None,
-                    'error': f'Rate limited: {str(e)}'
-                }
-                
-            except errors.RPCError as e:
-                return {
-                    'status': 'RPC_ERROR',
-                    'is_active': False,
-                    'title': None,
-                    'members_count': None,
-                    'entity_type': None,
-                    'error': f'API error: {str(e)}'
-                }
+            semaphore = asyncio.Semaphore(max_concurrent)
+            
+            async def check_channel(username):
+                for attempt in range(flood_wait_retries + 1):
+                    # Try to get channel info
+                    async with semaphore:
+                        try:
+                            result = await client(functions.channels.GetFullChannelRequest(channel=username))
+                            chat = result.chats[0] if result.chats else None
+                            full = result.full_chat
+                        
+                            return {
+                                'status': 'PUBLIC_OK',
+                                'is_active': True,
+                                'title': getattr(chat, "title", None),
+                                'members_count': getattr(full, "participants_count", None),
+                                'entity_type': 'channel',
+                                'error': None
+                            }
+                        
+                        except errors.UsernameNotOccupiedError:
+                            return {
+                                'status': 'NOT_FOUND',
+                                'is_active': False,
+                                'title': None,
+                                'members_count': None,
+                                'entity_type': None,
+                                'error': 'Channel not found'
+                            }
+                        
+                        except errors.FloodWaitError as e:
+                            # Short waits are retried once the window passes;
+                            # only long or repeated flood waits are reported
+                            if attempt == flood_wait_retries or e.seconds > FLOOD_WAIT_MAX_SECONDS:
+                                return {
+                                    'status': 'FLOODWAIT',
+                                    'is_active': False,
+                                    'title': None,
+                                    'members_count': None,
+                                    'entity_type': None,
+                                    'error': f'Rate limited: {str(e)}'
+                                }
+                            flood_wait = e.seconds + 1
+                        
+                        except errors.RPCError as e:
+                            return {
+                                'status': 'RPC_ERROR',
+                                'is_active': False,
+                                'title': None,
+                                'members_count': None,
+                                'entity_type': None,
+                                'error': f'API error: {str(e)}'
+                            }
+                        
+                        except Exception as e:
+                            return {
+                                'status': 'ERROR',
+                                'is_active': False,
+                                'title': None,
+                                'members_count': None,
+                                'entity_type': None,
+                                'error': f'Connection error: {str(e)}'
+                            }
+                    
+                    # Sleep outside the semaphore so other lookups keep running
+                    await asyncio.sleep(flood_wait)
+            
+            results = await asyncio.gather(*(check_channel(username) for username in usernames))
+            return dict(zip(usernames, results))
                 
         except ImportError:
-            return {
+            return same_result_for_all({
                 'status': 'TELEGRAM_LIBRARY_MISSING',
                 'is_active': False,
                 'title': None,
                 'members_count': None,
                 'entity_type': None,
                 'error': 'Telethon library not installed'
-            }
+            })
         except Exception as e:
-            return {
+            return same_result_for_all({
                 'status': 'ERROR',
                 'is_active': False,
                 'title': None,
                 'members_count': None,
                 'entity_type': None,
                 'error': f'Connection error: {str(e)}'
-            }
+            })
         finally:
             try:
                 await client.disconnect()
@@ -451,13 +516,13 @@ def validate_telegram_channel(username: str) -> dict:
     
     # Run the async function
     try:
-        return asyncio.run(check_channel())
+        return asyncio.run(check_channels())
     except Exception as e:
-        return {
+        return same_result_for_all({
             'status': 'ERROR',
             'is_active': False,
             'title': None,
             'members_count': None,
             'entity_type': None,
             'error': f'Async error: {str(e)}'
-        }
+        })
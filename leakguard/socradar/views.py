@@ -1,5 +1,5 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import HttpResponse, JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import authenticate, login, logout
 from django.views.decorators.http import require_POST
@@ -8,15 +8,60 @@ from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.utils import timezone
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Count, Q
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.core.paginator import Paginator
+from django.core.cache import cache
 from datetime import datetime, timedelta
+import logging
+import re
+import orjson
 # from .documents import CredentialLeakDocument, MonitoredCredentialDocument  # Disabled - requires OpenSearch
 
 from .models import *
 from .forms import CreateUserForm, MonitoredCredentialForm
+from .clients import get_http_session, get_minio, get_opensearch
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 
+logger = logging.getLogger(__name__)
+
+# Matches t.me/<username> and t.me/s/<username> links, with or without scheme
+_TME_RE = re.compile(r'(?:https?://)?t\.me/(?:s/)?([A-Za-z0-9_]{5,})')
+
+# t.me links and @mentions in the deepdarkCTI channel list (usernames of 3+ characters)
+LINK_RE = re.compile(r'(?:https?://)?t\.me/([a-zA-Z0-9_]{3,})|@([a-zA-Z0-9_]{3,})')
+
+# @username or a bare username (group 1), or any link containing t.me/username such as
+# HTTPS://www.t.me/s/username (group 2), as entered in the add channel form
+PARSE_RE = re.compile(r'^@?([A-Za-z0-9_]+)$|(?<![\w-])t\.me/(?:s/)?([A-Za-z0-9_]+)', re.IGNORECASE)
+
+# Words of a crawled URL search, reduced to characters that are safe in a raw tsquery
+SEARCH_TERM_RE = re.compile(r'[A-Za-z0-9]+')
+
+# telegram_links_dashboard channel_status filter -> channel condition
+STATUS_FILTERS = {
+    'active': Q(validation_status='PUBLIC_OK'),
+    'inactive': ~Q(validation_status='PUBLIC_OK'),
+    'not_found': Q(validation_status='NOT_FOUND'),
+    'auth_error': Q(validation_status__in=['AUTH_ERROR', 'AUTH_TIMEOUT']),
+    'api_error': Q(validation_status__in=['RPC_ERROR', 'ERROR']),
+    'no_api': Q(validation_status='NO_API_CREDENTIALS'),
+    'pending': Q(validation_status='PENDING'),
+}
+
+# Monitored credential type -> (model field, normalizer)
+FIELD_MAP = {
+    'email': ('email', str.lower),
+    'username': ('username', None),
+    'domain': ('domain', str.lower),
+    'custom': ('custom_value', None),
+}
+
+# How long the launching user can poll an automated collection task (seconds)
+AUTO_COLLECT_TASK_TTL = 24 * 60 * 60
+
 
 def registerPage(request):
     if request.method == 'POST':
@@ -70,7 +115,9 @@ def dashboard(request):
     new_alerts_count = Alert.objects.filter(user=request.user, is_read=False).count()
     
     # Get monitored channels (active Telegram channels)
-    monitored_channels = TelegramChannel.objects.filter(is_active=True).order_by('-created_at')
+    monitored_channels = TelegramChannel.objects.filter(is_active=True).only(
+        'id', 'name', 'username', 'description', 'last_scanned', 'created_at'
+    ).order_by('-created_at')
     monitored_sources_count = monitored_channels.count()
     
     # Get recent data leaks
@@ -78,7 +125,7 @@ def dashboard(request):
     total_leaks = DataLeak.objects.count()
     
     # Get recent messages
-    recent_messages = TelegramMessage.objects.order_by('-created_at')[:5]
+    recent_messages = TelegramMessage.objects.defer('text', 'file_path').order_by('-created_at')[:5]
     total_messages = TelegramMessage.objects.count()
 
     context = {
@@ -111,15 +158,16 @@ def add_monitored_credential(request):
         return redirect('dashboard')
     
     # Validate credential type
-    valid_types = ['email', 'username', 'domain', 'custom']
-    if target_type not in valid_types:
+    if target_type not in FIELD_MAP:
         messages.error(request, "Invalid credential type.")
         return redirect('dashboard')
     
     try:
-        # Create the credential object with the new model structure
+        # Set the appropriate field based on credential type
+        field, normalize = FIELD_MAP[target_type]
+        value = normalize(target_value) if normalize else target_value
+        
         credential_data = {
-            'owner': request.user,
             'credential_type': target_type,
             'priority': priority,
             'description': description,
@@ -127,28 +175,21 @@ def add_monitored_credential(request):
             'tags': sources  # Store selected sources as tags
         }
         
-        # Set the appropriate field based on credential type
-        if target_type == "email":
-            credential_data['email'] = target_value.lower()
-            # Check for existing email
-            existing = MonitoredCredential.objects.filter(owner=request.user, email=target_value.lower()).first()
-        elif target_type == "username":
-            credential_data['username'] = target_value
-            existing = MonitoredCredential.objects.filter(owner=request.user, username=target_value).first()
-        elif target_type == "domain":
-            credential_data['domain'] = target_value.lower()
-            existing = MonitoredCredential.objects.filter(owner=request.user, domain=target_value.lower()).first()        
-        elif target_type == "custom":
-            credential_data['custom_value'] = target_value
-            existing = MonitoredCredential.objects.filter(owner=request.user, custom_value=target_value).first()
+        try:
+            obj, created = MonitoredCredential.objects.get_or_create(
+                owner=request.user,
+                **{field: value},
+                defaults=credential_data
+            )
+        except MonitoredCredential.MultipleObjectsReturned:
+            # Older rows can hold duplicates (there is no unique constraint)
+            created = False
         
         # Check if credential already exists
-        if existing:
+        if not created:
             messages.info(request, f"That {target_type} is already being monitored.")
             return redirect("dashboard")
         
-        # Create new credential
-        obj = MonitoredCredential.objects.create(**credential_data)
         messages.success(request, f"{target_type.title()} credential added and will be monitored.")
         
     except Exception as e:
@@ -200,8 +241,8 @@ def send_alert_email(user_email, alert_data):
             fail_silently=False,
         )
         return True
-    except Exception as e:
-        print(f"Failed to send email notification: {str(e)}")
+    except Exception:
+        logger.exception("Failed to send email notification")
         return False
 
 def create_alert(user, title, message, alert_type='leak_detected', priority='medium', credential_leak=None):
@@ -291,39 +332,39 @@ def get_alerts(request):
     """API endpoint to get user's alerts"""
     from api.models import Alert
     
-    alerts = Alert.objects.filter(user=request.user).order_by('-created_at')
-    alerts_data = [{
-        'id': alert.id,
-        'title': alert.title,
-        'message': alert.message,
-        'alert_type': alert.alert_type,
-        'priority': alert.priority,
-        'is_read': alert.is_read,
-        'is_resolved': alert.is_resolved,
-        'created_at': alert.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-    } for alert in alerts]
-    
-    return JsonResponse({'alerts': alerts_data})
+    alerts = Alert.objects.filter(user=request.user).order_by('-created_at').values(
+        'id', 'title', 'message', 'alert_type', 'priority', 'is_read', 'is_resolved', 'created_at'
+    )
+    
+    def stream_alerts():
+        # Emit {"alerts": [...]} one row at a time so large alert lists are never held in memory
+        yield b'{"alerts":['
+        for i, alert in enumerate(alerts.iterator(chunk_size=500)):
+            alert['created_at'] = alert['created_at'].strftime('%Y-%m-%d %H:%M:%S')
+            yield (b',' if i else b'') + orjson.dumps(alert)
+        yield b']}'
+    
+    return StreamingHttpResponse(stream_alerts(), content_type='application/json')
 
 @login_required
 def update_alert_status(request, alert_id):
     """API endpoint to update alert status"""
     from api.models import Alert
     
-    try:
-        alert = Alert.objects.get(id=alert_id, user=request.user)
-        new_status = request.POST.get('status')
-        
-        if new_status == 'read':
-            alert.is_read = True
-        elif new_status == 'resolved':
-            alert.is_resolved = True
-        
-        alert.save()
-        return JsonResponse({'status': 'success'})
-        
-    except Alert.DoesNotExist:
+    alerts = Alert.objects.filter(id=alert_id, user=request.user)
+    new_status = request.POST.get('status')
+    
+    if new_status == 'read':
+        found = alerts.update(is_read=True)
+    elif new_status == 'resolved':
+        found = alerts.update(is_resolved=True)
+    else:
+        found = alerts.exists()
+    
+    if not found:
         return JsonResponse({'status': 'error', 'message': 'Alert not found'}, status=404)
+    
+    return JsonResponse({'status': 'success'})
 
 @login_required
 def telegram_monitor(request):
@@ -333,8 +374,7 @@ def telegram_monitor(request):
         
         if telegram_url:
             # Extract channel username from URL
-            import re
-            username_match = re.search(r't\.me/([a-zA-Z0-9_]+)', telegram_url)
+            username_match = _TME_RE.search(telegram_url)
             if username_match:
                 username = username_match.group(1)
                 
@@ -387,16 +427,24 @@ def process_telegram_data(request):
 def investigate_alert(request, alert_id):
     """Allow users to investigate alerts by fetching raw files from MinIO"""
     from api.models import Alert
-    from scripts.storage.minio_client import LeakGuardMinioClient
     
-    alert = get_object_or_404(Alert, id=alert_id, user=request.user)
+    # Load the alert and its leak in one query, leaving out the potentially large leak_content
+    alert = get_object_or_404(
+        Alert.objects.select_related('credential_leak').only(
+            'id', 'alert_type', 'title', 'message', 'priority', 'is_read', 'is_resolved',
+            'created_at', 'read_at', 'resolved_at', 'credential_leak',
+            'credential_leak__id', 'credential_leak__metadata', 'credential_leak__status'
+        ),
+        id=alert_id,
+        user=request.user
+    )
     
     raw_file_url = None
     source_document = None
     
     if alert.credential_leak and alert.credential_leak.metadata:
         try:
-            minio_client = LeakGuardMinioClient()
+            minio_client = get_minio()
             metadata = alert.credential_leak.metadata
             
             channel_id = metadata.get('channel_id')
@@ -410,30 +458,36 @@ def investigate_alert(request, alert_id):
                     expires_in_seconds=3600
                 )
                 
-                # Get source document from OpenSearch
-                from config.opensearch_config import OPENSEARCH_CONFIG
-                from opensearchpy import OpenSearch
-                
-                opensearch_client = OpenSearch(**OPENSEARCH_CONFIG)
-                query = {
-                    "query": {
-                        "bool": {
-                            "must": [
-                                {"term": {"channel_id": channel_id}},
-                                {"term": {"message_id": message_id}}
-                            ]
-                        }
-                    }
-                }
-                
-                results = opensearch_client.search(
-                    index="telegram-extracted-data",
-                    body=query,
-                    size=1
-                )
+                # Get source document from OpenSearch. Try the channel_id:message_id
+                # document id first; documents indexed without it are found by a
+                # one-hit filter search on the same fields
+                from opensearchpy import NotFoundError
                 
-                if results['hits']['hits']:
-                    source_document = results['hits']['hits'][0]['_source']
+                opensearch_client = get_opensearch()
+                try:
+                    doc = opensearch_client.get(
+                        index="telegram-extracted-data",
+                        id=f"{channel_id}:{message_id}"
+                    )
+                    source_document = doc['_source']
+                except NotFoundError:
+                    results = opensearch_client.search(
+                        index="telegram-extracted-data",
+                        body={
+                            "query": {
+                                "bool": {
+                                    "filter": [
+                                        {"term": {"channel_id": channel_id}},
+                                        {"term": {"message_id": message_id}}
+                                    ]
+                                }
+                            }
+                        },
+                        size=1,
+                        terminate_after=1
+                    )
+                    if results['hits']['hits']:
+                        source_document = results['hits']['hits'][0]['_source']
                     
         except Exception as e:
             messages.error(request, f'Error accessing raw data: {str(e)}')
@@ -451,10 +505,12 @@ def mark_alert_read(request, alert_id):
     """Mark an alert as read"""
     from api.models import Alert
     
-    alert = get_object_or_404(Alert, id=alert_id, user=request.user)
-    alert.is_read = True
-    alert.read_at = timezone.now()
-    alert.save()
+    updated = Alert.objects.filter(id=alert_id, user=request.user).update(
+        is_read=True,
+        read_at=timezone.now()
+    )
+    if not updated:
+        raise Http404("Alert not found")
     
     messages.success(request, 'Alert marked as read.')
     return redirect('investigate_alert', alert_id=alert_id)
@@ -463,19 +519,23 @@ def mark_alert_read(request, alert_id):
 @require_POST
 def resolve_alert(request, alert_id):
     """Resolve an alert"""
-    from api.models import Alert
+    from api.models import Alert, CredentialLeak
     
-    alert = get_object_or_404(Alert, id=alert_id, user=request.user)
     resolution = request.POST.get('resolution', 'resolved')
+    now = timezone.now()
     
-    alert.is_resolved = True
-    alert.resolved_at = timezone.now()
-    
-    if alert.credential_leak:
-        alert.credential_leak.status = resolution
-        alert.credential_leak.save()
-    
-    alert.save()
+    with transaction.atomic():
+        updated = Alert.objects.filter(id=alert_id, user=request.user).update(
+            is_resolved=True,
+            resolved_at=now
+        )
+        if not updated:
+            raise Http404("Alert not found")
+        
+        CredentialLeak.objects.filter(alert__id=alert_id).update(
+            status=resolution,
+            updated_at=now
+        )
     
     messages.success(request, f'Alert marked as {resolution}.')
     return redirect('investigate_alert', alert_id=alert_id)
@@ -501,31 +561,34 @@ def demo_telegram_collection(request):
             }
         ]
         
-        # Create demo channels
-        for channel_data in demo_channels:
-            channel, created = TelegramChannel.objects.get_or_create(
+        # Create demo channels (existing usernames are left untouched)
+        TelegramChannel.objects.bulk_create([
+            TelegramChannel(
                 username=channel_data['username'],
-                defaults={
-                    'name': channel_data['name'],
-                    'url': channel_data['url'],
-                    'description': 'Demo channel for testing',
-                    'is_active': True
-                }
+                name=channel_data['name'],
+                url=channel_data['url'],
+                description='Demo channel for testing',
+                is_active=True
             )
-        
-        # Create demo messages
-        for i, msg_data in enumerate(demo_messages):
-            channel = TelegramChannel.objects.get(username=msg_data['channel_username'])
-            # Use get_or_create to avoid duplicate constraint errors
-            TelegramMessage.objects.get_or_create(
-                channel=channel,
+            for channel_data in demo_channels
+        ], ignore_conflicts=True)
+        
+        channels_by_username = TelegramChannel.objects.filter(
+            username__in=[channel_data['username'] for channel_data in demo_channels]
+        ).in_bulk(field_name='username')
+        
+        # Create demo messages, ignoring ones that already exist
+        now = timezone.now()
+        TelegramMessage.objects.bulk_create([
+            TelegramMessage(
+                channel=channels_by_username[msg_data['channel_username']],
                 message_id=12345 + i,  # Use different message IDs
-                defaults={
-                    'text': msg_data['text'],
-                    'date': datetime.now(),
-                    'sender_username': 'demo_user'
-                }
+                text=msg_data['text'],
+                date=now,
+                sender_username='demo_user'
             )
+            for i, msg_data in enumerate(demo_messages)
+        ], ignore_conflicts=True)
         
         messages.success(request, 'Demo Telegram data created! Now process the data to see alerts.')
         return redirect('telegram_monitor')
@@ -534,142 +597,59 @@ def demo_telegram_collection(request):
 
 @login_required
 def auto_telegram_collection(request):
-    """Automated Telegram collection from GitHub"""
+    """Queue automated Telegram collection from GitHub as a background task"""
+    from .tasks import auto_collect_telegram_task
+    
     if request.method == 'POST':
         try:
-            # Import the automation components
-            import sys
-            import os
-            from datetime import datetime
-            sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            
-            from scripts.telegram.telegram_automation import GitHubLinkExtractor, TelegramCollector, TelegramConfig
-            from scripts.storage.opensearch_url_service import OpenSearchURLService
-            from socradar.models import CrawledURL
-            
-            # Get Telegram credentials from settings or environment
-            api_id = getattr(settings, 'TELEGRAM_API_ID', None) or os.getenv('TELEGRAM_API_ID')
-            api_hash = getattr(settings, 'TELEGRAM_API_HASH', None) or os.getenv('TELEGRAM_API_HASH')
-            phone_number = getattr(settings, 'TELEGRAM_PHONE', None) or os.getenv('TELEGRAM_PHONE')
-            
-            if not all([api_id, api_hash, phone_number]):
-                messages.error(request, 'Telegram API credentials not configured. Please set TELEGRAM_API_ID, TELEGRAM_API_HASH, and TELEGRAM_PHONE in settings.')
-                return redirect('telegram_monitor')
-            
-            # Step 1: Extract Telegram links from GitHub
-            extractor = GitHubLinkExtractor()
-            telegram_links = extractor.fetch_telegram_links()
-            
-            if not telegram_links:
-                messages.warning(request, 'No Telegram links found on GitHub page.')
-                return redirect('telegram_monitor')
-            
-            # Step 2: Validate links to check if they are active
-            from scripts.telegram.telegram_link_validator import validate_telegram_links
-            import asyncio
-            
-            # Run validation in async context
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                validated_links = loop.run_until_complete(
-                    validate_telegram_links(telegram_links, int(api_id), api_hash, phone_number)
-                )
-            finally:
-                loop.close()
-            
-            if not validated_links:
-                messages.warning(request, 'No active Telegram links found after validation.')
-                return redirect('telegram_monitor')
-            
-            # Generate unique crawl session ID
-            crawl_session_id = f"crawl_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            
-            # Step 3: Save validated URLs to OpenSearch
-            opensearch_service = OpenSearchURLService()
-            opensearch_success = opensearch_service.save_crawled_urls(validated_links, crawl_session_id)
-            
-            # Step 4: Save validated URLs to Django database
-            django_urls_saved = 0
-            for link in validated_links:
-                crawled_url, created = CrawledURL.objects.get_or_create(
-                    username=link['username'],
-                    crawl_session_id=crawl_session_id,
-                    defaults={
-                        'url': link['url'],
-                        'channel_name': link.get('channel_name', link['username']),
-                        'source': link.get('source', 'github'),
-                        'source_url': link.get('source_url', ''),
-                        'description': link.get('description', f'Auto-crawled from {link.get("source", "github")}'),
-                        'metadata': link.get('metadata', {}),
-                        'is_active': True
-                    }
-                )
-                if created:
-                    django_urls_saved += 1
-            
-            # Step 5: Add channels to TelegramChannel database
-            channels_added = 0
-            for link in validated_links:
-                channel, created = TelegramChannel.objects.get_or_create(
-                    username=link['username'],
-                    defaults={
-                        'name': link.get('title', link['username']),
-                        'url': link['url'],
-                        'description': link.get('description', f'Auto-added from {link["source"]}'),
-                        'is_active': True
-                    }
-                )
-                if created:
-                    channels_added += 1
-                    
-                    # Save channel to OpenSearch as well
-                    channel_data = {
-                        'id': channel.id,
-                        'name': channel.name,
-                        'username': channel.username,
-                        'url': channel.url,
-                        'description': channel.description,
-                        'is_active': channel.is_active,
-                        'created_at': channel.created_at.isoformat() if channel.created_at else None,
-                        'updated_at': channel.updated_at.isoformat() if channel.updated_at else None,
-                        'last_scanned': channel.last_scanned.isoformat() if channel.last_scanned else None,
-                        'crawl_session_id': crawl_session_id
-                    }
-                    opensearch_service.save_telegram_channel(channel_data)
-            
-            # Prepare success message with validation info
-            total_found = len(telegram_links)
-            active_found = len(validated_links)
-            inactive_count = total_found - active_found
-            
-            success_parts = []
-            if opensearch_success:
-                success_parts.append(f"Saved {active_found} active URLs to OpenSearch")
-            if django_urls_saved > 0:
-                success_parts.append(f"Saved {django_urls_saved} URLs to Django database")
-            if channels_added > 0:
-                success_parts.append(f"Added {channels_added} new Telegram channels")
-            
-            if success_parts:
-                message = f'Successfully completed auto-collection! {". ".join(success_parts)}.'
-                if inactive_count > 0:
-                    message += f" ({inactive_count} inactive/expired links were filtered out.)"
-                messages.success(request, message)
-            else:
-                messages.info(request, 'Auto-collection completed. All URLs were already in the database.')
-            
-            # Step 5: Start Telegram collection (this would run in background)
-            # For demo purposes, we'll just show the channels were added
-            # In production, you'd want to run this as a background task
-            
+            task = auto_collect_telegram_task.delay(request.user.id, force=request.POST.get('force') == '1')
+            # Remember who launched the task so only they can poll its status
+            cache.set(f'auto_collect_task:{task.id}', request.user.id, AUTO_COLLECT_TASK_TTL)
+            messages.info(request, f'Queued automated collection task {task.id}. Channels will appear once it completes.')
         except Exception as e:
-            messages.error(request, f'Error during automated collection: {str(e)}')
-            import traceback
-            print(f"Auto collection error: {traceback.format_exc()}")
+            messages.error(request, f'Error queuing automated collection: {str(e)}')
+            logger.exception("Auto collection error")
     
     return redirect('telegram_monitor')
 
+@login_required
+def auto_telegram_collection_status(request, task_id):
+    """Get the status of an automated Telegram collection task"""
+    from celery.result import AsyncResult
+    
+    if cache.get(f'auto_collect_task:{task_id}') != request.user.id:
+        raise Http404('Task not found')
+    
+    task_result = AsyncResult(task_id)
+    
+    if task_result.state == 'PROGRESS':
+        meta = task_result.info or {}
+        return JsonResponse({
+            'status': 'RUNNING',
+            'progress': meta.get('progress', 0),
+            'message': meta.get('status', 'Processing...')
+        })
+    elif task_result.state == 'SUCCESS':
+        result = task_result.result or {}
+        return JsonResponse({
+            'status': 'FAILED' if result.get('status') == 'FAILED' else 'COMPLETED',
+            'progress': 100,
+            'message': result.get('message') or result.get('error', ''),
+            'result': result
+        })
+    elif task_result.state == 'FAILURE':
+        return JsonResponse({
+            'status': 'FAILED',
+            'progress': 0,
+            'message': f'Collection failed: {str(task_result.info)}'
+        })
+    
+    return JsonResponse({
+        'status': task_result.state,
+        'progress': 0,
+        'message': f'Task state: {task_result.state}'
+    })
+
 @login_required
 def crawled_urls_investigation(request):
     """Display crawled URLs for investigation purposes"""
@@ -685,16 +665,24 @@ def crawled_urls_investigation(request):
         opensearch_service = OpenSearchURLService()
         opensearch_urls = opensearch_service.get_crawled_urls(limit=100)
     except Exception as e:
-        print(f"Could not fetch OpenSearch data: {e}")
+        logger.warning(f"Could not fetch OpenSearch data: {e}")
     
     # Search functionality
     search_query = request.GET.get('search', '')
-    if search_query:
-        crawled_urls = crawled_urls.filter(
-            models.Q(username__icontains=search_query) |
-            models.Q(channel_name__icontains=search_query) |
-            models.Q(description__icontains=search_query)
-        )
+    substring_match = models.Q(username__icontains=search_query) | \
+        models.Q(channel_name__icontains=search_query) | \
+        models.Q(description__icontains=search_query)
+    search_terms = SEARCH_TERM_RE.findall(search_query)
+    if len(search_query) >= 3 and search_terms:
+        # Every substring match is still returned; rows that also match the prefix
+        # full-text query (each word matches the start of a word) are ranked first
+        query = SearchQuery(' & '.join(f'{term}:*' for term in search_terms), config='simple', search_type='raw')
+        crawled_urls = crawled_urls.annotate(
+            search=CrawledURL.search_vector(),
+            rank=SearchRank(CrawledURL.search_vector(), query)
+        ).filter(models.Q(search=query) | substring_match).order_by('-rank', '-crawled_at')
+    elif search_query:
+        crawled_urls = crawled_urls.filter(substring_match)
     
     # Filter by leak status
     leak_filter = request.GET.get('leak_filter', '')
@@ -703,13 +691,24 @@ def crawled_urls_investigation(request):
     elif leak_filter == 'without_leaks':
         crawled_urls = crawled_urls.filter(credential_leaks_found=False)
     
+    # Both counts in a single aggregate query
+    counts = crawled_urls.aggregate(
+        total=Count('id'),
+        leaks=Count('id', filter=models.Q(credential_leaks_found=True))
+    )
+    
+    # Paginate, skipping the metadata JSON column which the list does not need
+    paginator = Paginator(crawled_urls.defer('metadata'), 50)
+    page_obj = paginator.get_page(request.GET.get('page', 1))
+    
     context = {
-        'crawled_urls': crawled_urls,
+        'crawled_urls': page_obj.object_list,
+        'page_obj': page_obj,
         'opensearch_urls': opensearch_urls,
         'search_query': search_query,
         'leak_filter': leak_filter,
-        'total_urls': crawled_urls.count(),
-        'urls_with_leaks': crawled_urls.filter(credential_leaks_found=True).count(),
+        'total_urls': counts['total'],
+        'urls_with_leaks': counts['leaks'],
     }
     
     return render(request, 'crawled_urls_investigation.html', context)
@@ -755,28 +754,48 @@ def start_telegram_scraping(request):
     
     return redirect('telegram_monitor')
 
+def _database_counts():
+    """Count channels, active channels, messages and data leaks in a single query"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT "
+            f"(SELECT COUNT(*) FROM {TelegramChannel._meta.db_table}), "
+            f"(SELECT COUNT(*) FROM {TelegramChannel._meta.db_table} WHERE is_active), "
+            f"(SELECT COUNT(*) FROM {TelegramMessage._meta.db_table}), "
+            f"(SELECT COUNT(*) FROM {DataLeak._meta.db_table})"
+        )
+        total_channels, active_channels, total_messages, total_data_leaks = cursor.fetchone()
+    
+    return {
+        'total_channels': total_channels,
+        'active_channels': active_channels,
+        'total_messages': total_messages,
+        'total_data_leaks': total_data_leaks,
+    }
+
 @login_required
 def database_status(request):
     """View to show database status and scraped data"""
     from api.models import Alert
     
-    # Get statistics
-    total_channels = TelegramChannel.objects.count()
-    active_channels = TelegramChannel.objects.filter(is_active=True).count()
-    total_messages = TelegramMessage.objects.count()
-    total_data_leaks = DataLeak.objects.count()
+    # Get statistics (global counts are shared by all users, so cache them briefly)
+    counts = cache.get_or_set('db_status_counts', _database_counts, 30)
     total_alerts = Alert.objects.filter(user=request.user).count()
     
     # Get recent data
-    recent_channels = TelegramChannel.objects.order_by('-created_at')[:10]
-    recent_messages = TelegramMessage.objects.order_by('-created_at')[:10]
+    recent_channels = TelegramChannel.objects.only(
+        'id', 'name', 'username', 'validation_status', 'validation_date', 'is_active', 'created_at'
+    ).order_by('-created_at')[:10]
+    recent_messages = TelegramMessage.objects.select_related('channel').defer(
+        'text', 'file_path', 'channel__description', 'channel__validation_error', 'channel__scraping_error'
+    ).order_by('-created_at')[:10]
     recent_leaks = DataLeak.objects.order_by('-created_at')[:10]
     
     context = {
-        'total_channels': total_channels,
-        'active_channels': active_channels,
-        'total_messages': total_messages,
-        'total_data_leaks': total_data_leaks,
+        'total_channels': counts['total_channels'],
+        'active_channels': counts['active_channels'],
+        'total_messages': counts['total_messages'],
+        'total_data_leaks': counts['total_data_leaks'],
         'total_alerts': total_alerts,
         'recent_channels': recent_channels,
         'recent_messages': recent_messages,
@@ -809,11 +828,14 @@ def telegram_links_dashboard(request):
     if suspicious_filter == 'true':
         links = links.filter(is_suspicious=True)
     
-    # Get recent links (last 100)
-    recent_links = links.order_by('-created_at')[:100]
+    # Get recent links (last 100), limited to the columns the dashboard shows
+    recent_links = links.only(
+        'id', 'url', 'validation_status', 'is_suspicious', 'created_at',
+        'channel', 'channel__username', 'message', 'message__message_id'
+    ).order_by('-created_at')[:100]
     
-    # Get statistics
-    stats = get_link_statistics()
+    # Get statistics (cached briefly; they are seven COUNT queries)
+    stats = cache.get_or_set('tl_stats', get_link_statistics, 60)
     
     # Get channel list for filter
     channels = TelegramChannel.objects.filter(is_active=True).order_by('username')
@@ -822,30 +844,19 @@ def telegram_links_dashboard(request):
     status_choices = TelegramLink.VALIDATION_STATUS_CHOICES
     
     # Get all channels and apply status filter
-    all_channels = TelegramChannel.objects.all().order_by('-created_at')
-    
-    # Apply channel status filter
-    if channel_status_filter == 'active':
-        filtered_channels = all_channels.filter(validation_status='PUBLIC_OK')
-    elif channel_status_filter == 'inactive':
-        filtered_channels = all_channels.exclude(validation_status='PUBLIC_OK')
-    elif channel_status_filter == 'not_found':
-        filtered_channels = all_channels.filter(validation_status='NOT_FOUND')
-    elif channel_status_filter == 'auth_error':
-        filtered_channels = all_channels.filter(validation_status__in=['AUTH_ERROR', 'AUTH_TIMEOUT'])
-    elif channel_status_filter == 'api_error':
-        filtered_channels = all_channels.filter(validation_status__in=['RPC_ERROR', 'ERROR'])
-    elif channel_status_filter == 'no_api':
-        filtered_channels = all_channels.filter(validation_status='NO_API_CREDENTIALS')
-    elif channel_status_filter == 'pending':
-        filtered_channels = all_channels.filter(validation_status='PENDING')
-    else:  # 'all'
-        filtered_channels = all_channels
+    all_channels = TelegramChannel.objects.only(
+        'id', 'username', 'url', 'description', 'is_active', 'validation_status', 'validation_error',
+        'scraping_status', 'scraping_error', 'created_at', 'updated_at'
+    ).order_by('-created_at')
+    
+    # Apply channel status filter ('all' and unknown values show every channel)
+    status_q = STATUS_FILTERS.get(channel_status_filter)
+    filtered_channels = all_channels.filter(status_q) if status_q is not None else all_channels
     
     # Get recent alerts data (from TelegramLink with high risk scores)
     recent_alerts = TelegramLink.objects.filter(
         is_suspicious=True
-    ).select_related('message', 'channel').order_by('-created_at')[:10]
+    ).select_related('message__channel', 'channel').order_by('-created_at')[:10]
     
     # Get monitored keywords (from your existing system)
     from api.models import MonitoredCredential
@@ -878,11 +889,43 @@ def telegram_links_dashboard(request):
     return render(request, 'telegram_links_dashboard.html', context)
 
 
+def _open_credential_search(opensearch_client, search_key, previous_state):
+    """Open a point in time on the credentials index for a new search"""
+    from .opensearch_client import SEARCH_PIT_KEEP_ALIVE
+    
+    if previous_state:
+        # Release the previous search's point in time instead of waiting for it to expire
+        try:
+            opensearch_client.client.delete_point_in_time(body={'pit_id': [previous_state['pit_id']]})
+        except Exception:
+            pass
+    
+    pit = opensearch_client.client.create_point_in_time(
+        index=opensearch_client.index_name, keep_alive=SEARCH_PIT_KEEP_ALIVE
+    )
+    return {'key': search_key, 'pit_id': pit['pit_id'], 'cursors': {}}
+
+
+def _credential_search_body(query, filters, size, page, state):
+    """Build a point-in-time search body for one page of credential results"""
+    from .opensearch_client import LeakGuardOpenSearchClient
+    
+    search_after = state['cursors'].get(str(page))
+    if search_after:
+        return LeakGuardOpenSearchClient.build_search_body(
+            query, filters, size, pit_id=state['pit_id'], search_after=search_after
+        )
+    # Pages jumped to directly have no cursor yet, so fall back to an offset
+    return LeakGuardOpenSearchClient.build_search_body(
+        query, filters, size, from_=(page - 1) * size, pit_id=state['pit_id']
+    )
+
+
 @login_required
 def search_credentials(request):
     """Search credentials using OpenSearch"""
-    from .opensearch_client import get_opensearch_client
-    from django.http import JsonResponse
+    from .opensearch_client import LeakGuardOpenSearchClient, get_opensearch_client
+    from opensearchpy import NotFoundError
     
     try:
         # Get search parameters
@@ -902,9 +945,6 @@ def search_credentials(request):
         if channel:
             filters['channel_username'] = channel
         
-        # Calculate pagination
-        from_ = (page - 1) * size
-        
         # Search using OpenSearch
         opensearch_client = get_opensearch_client()
         
@@ -917,22 +957,25 @@ def search_credentials(request):
                 'size': size
             })
         
-        # Perform search
-        results = opensearch_client.search_credentials(
-            query=query,
-            filters=filters,
-            size=size,
-            from_=from_
-        )
+        # Page through one point in time per search. Pages reached with Next
+        # continue from the previous page's sort values instead of a deep from_.
+        search_key = orjson.dumps([query, filters, size]).decode()
+        state = request.session.get('credential_search')
+        if page == 1 or not state or state['key'] != search_key:
+            state = _open_credential_search(opensearch_client, search_key, state)
         
-        if 'error' in results:
-            return JsonResponse({
-                'error': results['error'],
-                'results': [],
-                'total': 0,
-                'page': page,
-                'size': size
-            })
+        try:
+            response = opensearch_client.client.search(body=_credential_search_body(query, filters, size, page, state))
+        except NotFoundError:
+            # The point in time expired between pages
+            state = _open_credential_search(opensearch_client, search_key, None)
+            response = opensearch_client.client.search(body=_credential_search_body(query, filters, size, page, state))
+        results = LeakGuardOpenSearchClient.format_search_response(response)
+        
+        state['pit_id'] = response.get('pit_id', state['pit_id'])
+        if results['search_after']:
+            state['cursors'][str(page + 1)] = results['search_after']
+        request.session['credential_search'] = state
         
         return JsonResponse({
             'results': results['hits'],
@@ -958,25 +1001,31 @@ def search_credentials(request):
 def get_search_analytics(request):
     """Get search analytics and aggregations"""
     from .opensearch_client import get_opensearch_client
-    from django.http import JsonResponse
     
     try:
-        opensearch_client = get_opensearch_client()
-        
-        if not opensearch_client.is_available():
-            return JsonResponse({
-                'error': 'OpenSearch not available',
-                'analytics': {}
-            })
+        # Aggregations scan the whole index, so serve a cached copy unless ?refresh=1
+        analytics = None
+        if request.GET.get('refresh') != '1':
+            analytics = cache.get('os_aggs_v1')
         
-        # Get aggregations
-        analytics = opensearch_client.get_aggregations()
-        
-        if 'error' in analytics:
-            return JsonResponse({
-                'error': analytics['error'],
-                'analytics': {}
-            })
+        if analytics is None:
+            opensearch_client = get_opensearch_client()
+            
+            if not opensearch_client.is_available():
+                return JsonResponse({
+                    'error': 'OpenSearch not available',
+                    'analytics': {}
+                })
+            
+            analytics = opensearch_client.get_aggregations()
+            
+            if 'error' in analytics:
+                return JsonResponse({
+                    'error': analytics['error'],
+                    'analytics': {}
+                })
+            
+            cache.set('os_aggs_v1', analytics, 60)
         
         return JsonResponse({
             'analytics': analytics
@@ -995,7 +1044,9 @@ def bulk_index_existing_data(request):
     """Bulk index existing credentials to OpenSearch"""
     from .opensearch_client import get_opensearch_client
     from .models import ExtractedCredential
-    from django.http import JsonResponse
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    from django.db import connections
+    from itertools import islice
     
     try:
         opensearch_client = get_opensearch_client()
@@ -1005,35 +1056,75 @@ def bulk_index_existing_data(request):
                 'error': 'OpenSearch not available'
             })
         
-        # Get all credential IDs
-        credential_ids = list(ExtractedCredential.objects.values_list('id', flat=True))
+        batch_size = 1000
+        max_in_flight = 4
+        
+        def index_batch(batch_ids):
+            try:
+                return opensearch_client.bulk_index_credentials(batch_ids)
+            finally:
+                # Worker threads open their own database connections
+                connections.close_all()
+        
+        # Only credentials changed since the last successful sync, unless ?full=1
+        sync_started = timezone.now()
+        credentials = ExtractedCredential.objects.all()
+        last_sync = cache.get('os_credentials_last_sync')
+        if last_sync and request.GET.get('full') != '1':
+            credentials = credentials.filter(updated_at__gt=last_sync)
+        
+        # Stream IDs from the database and cut them into batches
+        id_iter = credentials.values_list('id', flat=True).iterator(chunk_size=batch_size)
+        batches = iter(lambda: list(islice(id_iter, batch_size)), [])
         
-        if not credential_ids:
+        total_ids = 0
+        total_indexed = 0
+        errors = []
+        
+        def collect(futures):
+            nonlocal total_indexed
+            for future in futures:
+                result = future.result()
+                if not result.get('success'):
+                    errors.append(result.get('error'))
+                    continue
+                total_indexed += result.get('indexed', 0)
+                # Partially failed batches count as failures so the sync watermark
+                # does not move past documents that never reached the index
+                if result.get('errors'):
+                    errors.append(f"{result['errors']} documents failed to index")
+        
+        # Keep a few batches in flight so database reads overlap with indexing
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            pending = set()
+            for batch_ids in batches:
+                total_ids += len(batch_ids)
+                pending.add(executor.submit(index_batch, batch_ids))
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                    if errors:
+                        break
+            collect(pending)
+        
+        if errors:
             return JsonResponse({
-                'message': 'No credentials to index',
-                'indexed': 0
+                'error': f"Failed to index batch: {errors[0]}",
+                'indexed': total_indexed
             })
         
-        # Bulk index in batches
-        batch_size = 1000
-        total_indexed = 0
+        cache.set('os_credentials_last_sync', sync_started, None)
         
-        for i in range(0, len(credential_ids), batch_size):
-            batch_ids = credential_ids[i:i + batch_size]
-            result = opensearch_client.bulk_index_credentials(batch_ids)
-            
-            if result.get('success'):
-                total_indexed += result.get('indexed', 0)
-            else:
-                return JsonResponse({
-                    'error': f"Failed to index batch: {result.get('error')}",
-                    'indexed': total_indexed
-                })
+        if not total_ids:
+            return JsonResponse({
+                'message': 'No credentials to index',
+                'indexed': 0
+            })
         
         return JsonResponse({
             'message': f'Successfully indexed {total_indexed} credentials',
             'indexed': total_indexed,
-            'total': len(credential_ids)
+            'total': total_ids
         })
         
     except Exception as e:
@@ -1058,13 +1149,11 @@ def add_telegram_channel(request):
         return redirect('telegram_links_dashboard')
     
     # Parse channel link to extract username
-    username = None
-    if channel_link.startswith('@'):
-        username = channel_link[1:]
-    elif 't.me/' in channel_link:
-        username = channel_link.split('t.me/')[-1].split('?')[0]
-    else:
-        username = channel_link
+    match = PARSE_RE.search(channel_link)
+    if not match:
+        messages.error(request, "Please provide a valid Telegram channel link or username.")
+        return redirect('telegram_links_dashboard')
+    username = match.group(1) or match.group(2)
     
     # Check if channel already exists
     if TelegramChannel.objects.filter(username=username).exists():
@@ -1150,17 +1239,16 @@ def remove_telegram_channel(request, channel_id):
 @login_required
 def process_telegram_links_view(request):
     """Process Telegram links via web interface"""
-    from .management.commands.process_telegram_links import Command
+    from .tasks import process_telegram_links_task
     
     try:
-        # Run the management command
-        command = Command()
-        command.handle()
+        # Queue the management command instead of running it in the request
+        task = process_telegram_links_task.delay()
         
-        messages.success(request, "Telegram links processed successfully.")
+        messages.success(request, f"Started processing Telegram links. Task ID: {task.id}")
         
     except Exception as e:
-        messages.error(request, f"Failed to process links: {str(e)}")
+        messages.error(request, f"Failed to queue link processing: {str(e)}")
     
     # Stay on the same page
     return redirect(request.META.get('HTTP_REFERER', 'telegram_links_dashboard'))
@@ -1169,45 +1257,69 @@ def process_telegram_links_view(request):
 def crawl_telegram_channels(request):
     """Crawl GitHub repository to discover and validate Telegram channels"""
     import requests
-    import re
     from django.utils import timezone
     from .models import TelegramChannel
-    from .utils import validate_telegram_channel
+    from .utils import validate_telegram_channels
     
     try:
         # Fetch the GitHub markdown content
         github_url = "https://raw.githubusercontent.com/fastfire/deepdarkCTI/main/telegram_infostealer.md"
-        response = requests.get(github_url, timeout=30)
-        response.raise_for_status()
-        
-        # Extract Telegram channel links from markdown
-        content = response.text
-        telegram_links = re.findall(r'https://t\.me/([a-zA-Z0-9_]+)', content)
-        
-        # Also extract @username patterns
-        at_patterns = re.findall(r'@([a-zA-Z0-9_]+)', content)
-        
-        # Combine and deduplicate
-        all_usernames = list(set(telegram_links + at_patterns))
+        cache_key = f'crawl:github:v2:{github_url}'
+        cached = None if request.POST.get('force') == '1' else cache.get(cache_key)
+        
+        # Conditional GET so an unchanged file is not downloaded again
+        headers = {'Accept-Encoding': 'gzip'}
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        
+        with get_http_session().get(github_url, headers=headers, stream=True, timeout=30) as response:
+            if response.status_code == 304 and cached:
+                usernames = cached['usernames']
+            else:
+                response.raise_for_status()
+                
+                # Extract t.me links and @username patterns line by line in one pass, deduplicated.
+                # iter_lines reassembles lines across 64KB reads, so no match is split
+                found = set()
+                for line in response.iter_lines(chunk_size=64 * 1024):
+                    for match in LINK_RE.finditer(line.decode('utf-8', 'replace')):
+                        found.add(match.group(1) or match.group(2))
+                usernames = list(found)
+                
+                # Keep the parsed set until the file changes
+                cache.set(cache_key, {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'usernames': usernames,
+                }, None)
+        
+        # Look up existing channels in one query and validate all channels concurrently
+        existing_channels = TelegramChannel.objects.filter(username__in=usernames).only(
+            'id', 'username', 'validation_status', 'validation_date', 'validation_error', 'is_active', 'updated_at'
+        ).in_bulk(field_name='username')
+        validation_results = validate_telegram_channels(usernames)
         
         discovered_channels = []
         skipped_channels = []
+        updated_objs = []
+        new_objs = []
+        now = timezone.now()
         
-        for username in all_usernames:
-            # Skip if username is too short or contains invalid characters
-            if len(username) < 3 or not re.match(r'^[a-zA-Z0-9_]+$', username):
-                continue
-                
+        for username in usernames:
+            validation_result = validation_results[username]
+            
             # Check if channel already exists
-            existing_channel = TelegramChannel.objects.filter(username=username).first()
+            existing_channel = existing_channels.get(username)
             if existing_channel:
                 # Update existing channel with fresh validation status
-                validation_result = validate_telegram_channel(username)
                 existing_channel.validation_status = validation_result['status']
-                existing_channel.validation_date = timezone.now()
+                existing_channel.validation_date = now
                 existing_channel.validation_error = validation_result.get('error', '')
                 existing_channel.is_active = validation_result['is_active']
-                existing_channel.save()
+                existing_channel.updated_at = now  # bulk_update skips auto_now
+                updated_objs.append(existing_channel)
                 
                 skipped_channels.append({
                     'username': username,
@@ -1215,20 +1327,17 @@ def crawl_telegram_channels(request):
                 })
                 continue
             
-            # Use the new validation function
-            validation_result = validate_telegram_channel(username)
-            
             # Create new channel with detailed validation info
-            channel = TelegramChannel.objects.create(
+            new_objs.append(TelegramChannel(
                 name=f"Discovered: {username}",
                 username=username,
                 url=f"https://t.me/{username}",
                 description=f"Discovered from deepdarkCTI repository",
                 is_active=validation_result['is_active'],
                 validation_status=validation_result['status'],
-                validation_date=timezone.now(),
+                validation_date=now,
                 validation_error=validation_result.get('error', '')
-            )
+            ))
             
             discovered_channels.append({
                 'username': username,
@@ -1237,12 +1346,27 @@ def crawl_telegram_channels(request):
                 'title': validation_result['title'],
                 'members_count': validation_result['members_count'],
                 'error': validation_result['error'],
-                'new': True,
-                'channel_id': channel.id
+                'new': True
             })
         
+        # Write all channel changes in batches instead of one query per channel
+        TelegramChannel.objects.bulk_update(
+            updated_objs,
+            ['validation_status', 'validation_date', 'validation_error', 'is_active', 'updated_at'],
+            batch_size=500
+        )
+        TelegramChannel.objects.bulk_create(new_objs, batch_size=500, ignore_conflicts=True)
+        
+        # Validation fails fast on flood waits; retry those channels in the background
+        if any(result['status'] == 'FLOODWAIT' for result in validation_results.values()):
+            from .tasks import revalidate_rate_limited_channels_task
+            try:
+                revalidate_rate_limited_channels_task.delay()
+            except Exception as e:
+                logger.warning(f"Could not queue revalidation of rate-limited channels: {e}")
+        
         # Prepare detailed success message
-        total_found = len(all_usernames)
+        total_found = len(usernames)
         new_channels = len(discovered_channels)
         updated_channels = len(skipped_channels)
         active_count = sum(1 for c in discovered_channels if c['is_active'])
@@ -1313,21 +1437,9 @@ def scrape_telegram_channel(request, channel_id):
             messages.success(request, f'Started scraping channel @{channel.username}. Task ID: {task.id}')
             
         except Exception as celery_error:
-            # Fallback to synchronous scraping if Celery is not available
-            messages.info(request, f'Running scraping synchronously for @{channel.username} (Celery not available)')
-            
-            try:
-                # Import and run scraper directly
-                from .scraper import run_sync_scraping
-                result = run_sync_scraping(channel.username, last_scraped_msg_id)
-                
-                if result['success']:
-                    messages.success(request, f'Successfully scraped @{channel.username}: {result["messages_count"]} messages, {result["files_count"]} files')
-                else:
-                    messages.error(request, f'Error scraping @{channel.username}: {result["error"]}')
-                    
-            except Exception as scraping_error:
-                messages.error(request, f'Error during scraping: {str(scraping_error)}')
+            # Never scrape inline: it would hold the HTTP worker for the whole scrape
+            logger.error(f"Failed to queue scraping for @{channel.username}: {celery_error}")
+            messages.error(request, f'Scraping queue is unavailable, could not start scraping @{channel.username}. Please try again later.')
         
     except TelegramChannel.DoesNotExist:
         messages.error(request, 'Channel not found')